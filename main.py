@@ -4,6 +4,14 @@ PixelWiz - Advanced Image Processing Desktop Application
 A modern image editing application built with Python, PyQt5, and OpenCV.
 Features include rotation, cropping, filters, noise generation, and more.
 
+Images are held as NumPy arrays in OpenCV's native BGR channel order for the
+whole pipeline and handed to Qt as QImage.Format_BGR888, so no RGB/BGR swap
+happens on load, save or display.
+
+OpenCV is tuned when src.core.image_processor is imported: optimized code
+paths are enabled and its thread pool is capped at one less than the CPU
+count so processing does not starve the UI thread.
+
 Author: Bhvaya Sharma
 Version: 1.0.0
 """
@@ -3,13 +3,31 @@ Image Processing Engine for PixelWiz
 
 This module contains all the core image processing operations including
 filters, transformations, noise generation, and enhancement operations.
+
+Color images are kept in OpenCV's native BGR channel order from load to save.
 """
 
+import math
+import mmap
+import os
 import cv2
 import numpy as np
-from typing import Tuple, Optional, Union
+from functools import lru_cache
+from typing import Dict, Tuple, Optional, Union
 from enum import Enum
 
+# Leave one core free for the Qt event loop and make sure SIMD paths are enabled
+cv2.setUseOptimized(True)
+cv2.setNumThreads(max(1, (os.cpu_count() or 2) - 1))
+
+# Files larger than this are decoded from a read-only memory map
+MMAP_LOAD_BYTES = 256 * 1024 * 1024
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; noise falls back to the NumPy path
+    njit = None
+
 class FilterType(Enum):
     """Enumeration of available filter types."""
     GRAYSCALE = "grayscale"
@@ -24,17 +42,118 @@ class NoiseType(Enum):
     GAUSSIAN = "gaussian"
     SALT_PEPPER = "salt_pepper"
 
+# Filter kernels, built once as float32 so OpenCV takes its single-precision path
+_LAPLACIAN_K = np.array([[0, -1, 0],
+                         [-1, 5, -1],
+                         [0, -1, 0]], dtype=np.float32)
+
+# Sepia weights with rows and columns in B, G, R order
+_SEPIA_K = np.array([[0.131, 0.534, 0.272],
+                     [0.168, 0.686, 0.349],
+                     [0.189, 0.769, 0.393]], dtype=np.float32)
+
+_EMBOSS_K = np.array([[-2, -1, 0],
+                      [-1, 1, 1],
+                      [0, 1, 2]], dtype=np.float32)
+
+_INVERT_LUT = np.arange(255, -1, -1, dtype=np.uint8)
+
+# 1-D Gaussian kernels by size, shared by every blur call
+_gauss_cache: Dict[int, np.ndarray] = {}
+
+def _gaussian_kernel(kernel_size: int) -> np.ndarray:
+    """Get the cached 1-D Gaussian kernel for a kernel size (sigma derived from size)."""
+    kernel = _gauss_cache.get(kernel_size)
+    if kernel is None:
+        kernel = _gauss_cache.setdefault(kernel_size, cv2.getGaussianKernel(kernel_size, 0, cv2.CV_32F))
+    return kernel
+
+# PCG64 generator for the NumPy noise path; faster than the legacy global RNG
+_rng = np.random.default_rng()
+
+@lru_cache(maxsize=64)
+def _brightness_contrast_lut(brightness: int, contrast: float) -> np.ndarray:
+    """Build the 256-entry lookup table for a brightness/contrast pair."""
+    lut = np.arange(256, dtype=np.float32) * contrast + brightness
+    return np.clip(lut, 0, 255).astype(np.uint8)
+
+if njit is not None:
+    @njit(parallel=True, nogil=True, cache=True, fastmath=True)
+    def _salt_pepper(img, out, intensity):
+        """Write salt-and-pepper noise over a 2-D uint8 view in one pass."""
+        low = intensity / 2
+        high = 1.0 - intensity / 2
+        rows, cols = img.shape
+        for i in prange(rows):
+            for j in range(cols):
+                r = np.random.random()
+                if r < low:
+                    out[i, j] = 0  # Pepper
+                elif r > high:
+                    out[i, j] = 255  # Salt
+                else:
+                    out[i, j] = img[i, j]
+
+    # Compile once at import so the first noise request doesn't pay for the JIT
+    _salt_pepper(np.zeros((1, 1), np.uint8), np.empty((1, 1), np.uint8), 0.1)
+else:
+    _salt_pepper = None
+
 class ImageProcessor:
-    """Core image processing class with all editing operations."""
+    """Core image processing class with all editing operations.
+    
+    Instances keep scratch buffers for intermediate results, so each worker
+    thread should use its own processor.
+    """
+    
+    def __init__(self):
+        self._scratch = {}
+    
+    def _buf(self, tag: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """Return a reusable buffer for an intermediate result.
+        
+        Only intermediates go through here; images handed back to callers are
+        always freshly allocated because the UI keeps them.
+        """
+        buf = self._scratch.get(tag)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._scratch[tag] = buf
+        return buf
+    
+    def _gray(self, image: np.ndarray) -> np.ndarray:
+        """Convert to grayscale into the shared gray scratch buffer."""
+        if image.ndim == 2:
+            return image
+        dst = self._buf("gray", image.shape[:2], np.uint8)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=dst)
+    
+    def _mono_dst(self, shape: Tuple[int, int], to_rgb: bool) -> Optional[np.ndarray]:
+        """Scratch target for a monochrome result, or None if it goes back to the caller."""
+        return self._buf("mono", shape, np.uint8) if to_rgb else None
+    
+    @staticmethod
+    def _mono_result(mono: np.ndarray, to_rgb: bool) -> np.ndarray:
+        """Return a monochrome result, expanded to BGR only when requested."""
+        return cv2.cvtColor(mono, cv2.COLOR_GRAY2BGR) if to_rgb else mono
     
     @staticmethod
     def load_image(file_path: str) -> Optional[np.ndarray]:
         """Load an image from file path."""
         try:
-            image = cv2.imread(file_path)
-            if image is not None:
-                return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            return None
+            if os.path.getsize(file_path) <= MMAP_LOAD_BYTES:
+                return cv2.imread(file_path)
+            
+            # Let the decoder pull pages from the mapped file instead of reading it into a buffer first
+            with open(file_path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    data = np.frombuffer(mapped, dtype=np.uint8)
+                    image = cv2.imdecode(data, cv2.IMREAD_COLOR)
+                    del data  # release the buffer export so the map can close
+                finally:
+                    mapped.close()
+            return image
         except Exception as e:
             print(f"Error loading image: {e}")
             return None
@@ -43,9 +162,8 @@ class ImageProcessor:
     def save_image(image: np.ndarray, file_path: str) -> bool:
         """Save an image to file path."""
         try:
-            # Convert RGB to BGR for OpenCV
-            bgr_image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-            return cv2.imwrite(file_path, bgr_image)
+            # Images are already in OpenCV's BGR layout
+            return cv2.imwrite(file_path, image)
         except Exception as e:
             print(f"Error saving image: {e}")
             return False
@@ -60,22 +178,23 @@ class ImageProcessor:
         elif angle == 270:
             return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
         else:
-            # Arbitrary angle rotation
+            # Arbitrary angle rotation, building the matrix directly from cos/sin
             h, w = image.shape[:2]
-            center = (w // 2, h // 2)
-            rotation_matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
+            cx, cy = w // 2, h // 2
+            rad = math.radians(angle)
+            c, s = math.cos(rad), math.sin(rad)
             
             # Calculate new dimensions
-            cos_val = abs(rotation_matrix[0, 0])
-            sin_val = abs(rotation_matrix[0, 1])
-            new_w = int((h * sin_val) + (w * cos_val))
-            new_h = int((h * cos_val) + (w * sin_val))
+            new_w = int((h * abs(s)) + (w * abs(c)))
+            new_h = int((h * abs(c)) + (w * abs(s)))
             
-            # Adjust rotation matrix for new center
-            rotation_matrix[0, 2] += (new_w / 2) - center[0]
-            rotation_matrix[1, 2] += (new_h / 2) - center[1]
+            # Rotate about the old center and translate it to the new center
+            rotation_matrix = np.empty((2, 3), dtype=np.float64)
+            rotation_matrix[0] = (c, s, new_w / 2 - c * cx - s * cy)
+            rotation_matrix[1] = (-s, c, new_h / 2 + s * cx - c * cy)
             
-            return cv2.warpAffine(image, rotation_matrix, (new_w, new_h))
+            return cv2.warpAffine(image, rotation_matrix, (new_w, new_h),
+                                  flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
     
     @staticmethod
     def crop_image(image: np.ndarray, x: int, y: int, width: int, height: int) -> np.ndarray:
@@ -86,7 +205,8 @@ class ImageProcessor:
         width = min(width, w - x)
         height = min(height, h - y)
         
-        return image[y:y+height, x:x+width]
+        # Copy the region out so later steps get a packed buffer and the full image can be freed
+        return image[y:y+height, x:x+width].copy()
     
     @staticmethod
     def flip_image(image: np.ndarray, horizontal: bool = True) -> np.ndarray:
@@ -99,55 +219,76 @@ class ImageProcessor:
     @staticmethod
     def adjust_brightness_contrast(image: np.ndarray, brightness: int = 0, contrast: float = 1.0) -> np.ndarray:
         """Adjust brightness and contrast of image."""
-        # Convert to float to prevent overflow
-        adjusted = image.astype(np.float32)
-        adjusted = adjusted * contrast + brightness
+        # Single uint8 pass through a cached LUT (reused across slider drags)
+        lut = _brightness_contrast_lut(brightness, contrast)
+        return cv2.LUT(image, lut)
+    
+    @staticmethod
+    def point_lut(operation: str, **params) -> Optional[np.ndarray]:
+        """Get the 256-entry LUT for a per-channel point operation.
         
-        # Clip values to valid range
-        adjusted = np.clip(adjusted, 0, 255)
-        return adjusted.astype(np.uint8)
+        Returns None for operations that mix channels or neighbouring pixels,
+        which cannot be expressed as a single lookup table.
+        """
+        if operation == "brightness_contrast":
+            return _brightness_contrast_lut(params.get('brightness', 0), params.get('contrast', 1.0))
+        if operation == "filter" and params.get('filter_type') == FilterType.INVERT:
+            return _INVERT_LUT
+        return None
     
     @staticmethod
-    def sharpen_image(image: np.ndarray, method: str = "laplacian", strength: float = 1.0) -> np.ndarray:
+    def apply_lut(image: np.ndarray, lut: np.ndarray) -> np.ndarray:
+        """Map every channel of image through a 256-entry lookup table."""
+        return cv2.LUT(image, lut)
+    
+    def sharpen_image(self, image: np.ndarray, method: str = "laplacian", strength: float = 1.0) -> np.ndarray:
         """Sharpen image using specified method."""
         if method == "laplacian":
-            # Laplacian kernel sharpening
-            kernel = np.array([[0, -1, 0],
-                             [-1, 5, -1],
-                             [0, -1, 0]])
-            sharpened = cv2.filter2D(image, -1, kernel)
+            # Laplacian kernel sharpening (filter2D saturates to the uint8 input depth)
+            return cv2.filter2D(image, -1, _LAPLACIAN_K)
         elif method == "unsharp_mask":
-            # Unsharp mask sharpening
-            gaussian = cv2.GaussianBlur(image, (0, 0), 2.0)
-            sharpened = cv2.addWeighted(image, 1.0 + strength, gaussian, -strength, 0)
+            # Unsharp mask with a fixed 5x5 blur; saturation happens inside addWeighted
+            gaussian = cv2.GaussianBlur(image, (5, 5), 1.0,
+                                        dst=self._buf("blur", image.shape, image.dtype))
+            return cv2.addWeighted(image, 1.0 + strength, gaussian, -strength, 0, dtype=cv2.CV_8U)
         else:
             return image
-        
-        return np.clip(sharpened, 0, 255).astype(np.uint8)
     
     @staticmethod
     def add_noise(image: np.ndarray, noise_type: NoiseType, intensity: float = 0.1) -> np.ndarray:
         """Add noise to image."""
-        h, w, c = image.shape
-        noisy_image = image.astype(np.float32)
-        
         if noise_type == NoiseType.GAUSSIAN:
-            # Gaussian noise
-            noise = np.random.normal(0, intensity * 255, (h, w, c))
-            noisy_image += noise
-        elif noise_type == NoiseType.SALT_PEPPER:
-            # Salt and pepper noise
-            noise = np.random.random((h, w, c))
+            # int16 noise plus a saturating add keeps the whole path in OpenCV
+            channels = 1 if image.ndim == 2 else image.shape[2]
+            noise = np.empty(image.shape, dtype=np.int16)
+            cv2.randn(noise, (0,) * channels, (intensity * 255,) * channels)
+            return cv2.add(image, noise, dtype=cv2.CV_8U)
+        
+        if noise_type == NoiseType.SALT_PEPPER and _salt_pepper is not None:
+            # Fold channels into columns so the kernel walks one flat row per line
+            image = np.ascontiguousarray(image)
+            noisy_image = np.empty_like(image)
+            rows = image.shape[0]
+            _salt_pepper(image.reshape(rows, -1), noisy_image.reshape(rows, -1), intensity)
+            return noisy_image
+        
+        if noise_type == NoiseType.SALT_PEPPER:
+            # NumPy fallback when Numba is unavailable
+            noise = np.empty(image.shape, dtype=np.float32)
+            _rng.random(dtype=np.float32, out=noise)
+            noisy_image = image.copy()
             noisy_image[noise < intensity/2] = 0  # Pepper
             noisy_image[noise > 1 - intensity/2] = 255  # Salt
+            return noisy_image
         
-        return np.clip(noisy_image, 0, 255).astype(np.uint8)
+        return image.copy()
     
     @staticmethod
     def blur_image(image: np.ndarray, blur_type: str = "gaussian", kernel_size: int = 5) -> np.ndarray:
         """Apply blur to image."""
         if blur_type == "gaussian":
-            return cv2.GaussianBlur(image, (kernel_size, kernel_size), 0)
+            kernel = _gaussian_kernel(kernel_size)
+            return cv2.sepFilter2D(image, -1, kernel, kernel)
         elif blur_type == "median":
             return cv2.medianBlur(image, kernel_size)
         elif blur_type == "bilateral":
@@ -155,53 +296,64 @@ class ImageProcessor:
         else:
             return image
     
-    @staticmethod
-    def apply_filter(image: np.ndarray, filter_type: FilterType) -> np.ndarray:
-        """Apply various filters to image."""
+    def apply_filter(self, image: np.ndarray, filter_type: FilterType, to_rgb: bool = False) -> np.ndarray:
+        """Apply various filters to image.
+        
+        Grayscale, edge and emboss filters return a single-channel (H, W) array
+        unless to_rgb is set, in which case they are expanded to three channels.
+        """
         if filter_type == FilterType.GRAYSCALE:
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+            if image.ndim == 2:
+                return self._mono_result(image.copy(), to_rgb)
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._mono_dst(image.shape[:2], to_rgb))
+            return self._mono_result(gray, to_rgb)
         
         elif filter_type == FilterType.SEPIA:
-            sepia_kernel = np.array([[0.272, 0.534, 0.131],
-                                   [0.349, 0.686, 0.168],
-                                   [0.393, 0.769, 0.189]])
-            sepia_image = cv2.transform(image, sepia_kernel)
-            return np.clip(sepia_image, 0, 255).astype(np.uint8)
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR, dst=self._buf("rgb", image.shape + (3,), np.uint8))
+            # transform saturates back to the uint8 input depth
+            return cv2.transform(image, _SEPIA_K)
         
         elif filter_type == FilterType.INVERT:
-            return 255 - image
+            return cv2.bitwise_not(image)
         
         elif filter_type == FilterType.SOBEL_EDGE:
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            sobel_x = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-            sobel_y = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-            sobel = np.sqrt(sobel_x**2 + sobel_y**2)
-            sobel = np.clip(sobel, 0, 255).astype(np.uint8)
-            return cv2.cvtColor(sobel, cv2.COLOR_GRAY2RGB)
+            gray = self._gray(image)
+            sobel_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3,
+                                dst=self._buf("sobel_x", gray.shape, np.float32))
+            sobel_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3,
+                                dst=self._buf("sobel_y", gray.shape, np.float32))
+            # Magnitude and saturating cast to uint8 stay inside OpenCV
+            magnitude = cv2.magnitude(sobel_x, sobel_y, sobel_x)
+            sobel = cv2.convertScaleAbs(magnitude, dst=self._mono_dst(gray.shape, to_rgb))
+            return self._mono_result(sobel, to_rgb)
         
         elif filter_type == FilterType.CANNY_EDGE:
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            edges = cv2.Canny(gray, 100, 200)
-            return cv2.cvtColor(edges, cv2.COLOR_GRAY2RGB)
+            gray = self._gray(image)
+            edges = cv2.Canny(gray, 100, 200, edges=self._mono_dst(gray.shape, to_rgb))
+            return self._mono_result(edges, to_rgb)
         
         elif filter_type == FilterType.EMBOSS:
-            emboss_kernel = np.array([[-2, -1, 0],
-                                    [-1, 1, 1],
-                                    [0, 1, 2]])
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-            embossed = cv2.filter2D(gray, -1, emboss_kernel)
-            # Add 128 to make it visible
-            embossed = np.clip(embossed + 128, 0, 255).astype(np.uint8)
-            return cv2.cvtColor(embossed, cv2.COLOR_GRAY2RGB)
+            gray = self._gray(image)
+            # Signed response keeps negative relief; shift by 128 and saturate in one pass
+            embossed = cv2.filter2D(gray, cv2.CV_16S, _EMBOSS_K,
+                                    dst=self._buf("emboss", gray.shape, np.int16))
+            embossed = cv2.add(embossed, 128, dst=self._mono_dst(gray.shape, to_rgb),
+                               dtype=cv2.CV_8U)
+            return self._mono_result(embossed, to_rgb)
         
         return image
     
     @staticmethod
-    def resize_image(image: np.ndarray, width: int, height: int, maintain_aspect: bool = True) -> np.ndarray:
-        """Resize image to specified dimensions."""
+    def resize_image(image: np.ndarray, width: int, height: int, maintain_aspect: bool = True,
+                     quality: str = "auto") -> np.ndarray:
+        """Resize image to specified dimensions.
+        
+        ``quality="auto"`` uses area averaging when shrinking and bilinear when
+        enlarging; ``quality="high"`` always uses Lanczos.
+        """
+        h, w = image.shape[:2]
         if maintain_aspect:
-            h, w = image.shape[:2]
             aspect_ratio = w / h
             
             if width / height > aspect_ratio:
@@ -212,7 +364,14 @@ class ImageProcessor:
                 # Width is the limiting factor
                 new_width = width
                 new_height = int(width / aspect_ratio)
-            
-            return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
         else:
-            return cv2.resize(image, (width, height), interpolation=cv2.INTER_LANCZOS4)
+            new_width, new_height = width, height
+        
+        if quality == "high":
+            interpolation = cv2.INTER_LANCZOS4
+        elif new_width * new_height < w * h:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LINEAR
+        
+        return cv2.resize(image, (new_width, new_height), interpolation=interpolation)
@@ -5,183 +5,351 @@ Handles heavy image processing operations in separate threads to keep UI respons
 Uses PyQt5's QThread for thread-safe signal-slot communication.
 """
 
+import itertools
+import queue
+import threading
 import traceback
-from PyQt5.QtCore import QThread, pyqtSignal, QObject
+from PyQt5.QtCore import QThread, pyqtSignal, QObject, QCoreApplication, QRunnable
 from PyQt5.QtGui import QPixmap
 import numpy as np
 from typing import Callable, Any, Dict, Optional
 from src.core.image_processor import ImageProcessor, FilterType, NoiseType
 
+# Operations that modify their input buffer in place. Every ImageProcessor
+# method returns a new array, so workers can read the caller's image directly.
+_MUTATING_OPS = frozenset()
+
+# Operations that supersede each other while a slider is being dragged
+REAL_TIME_OPERATIONS = frozenset({"brightness_contrast"})
+
+class ProcessingJob:
+    """A single queued operation for the processing worker."""
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, image: np.ndarray, operation: str, **kwargs):
+        self.job_id = next(self._ids)
+        # Only copy when the operation would write into the shared buffer
+        self.image = image.copy() if operation in _MUTATING_OPS else image
+        self.operation = operation
+        self.kwargs = kwargs
+        self.cancel_token = threading.Event()
+        self.is_real_time = operation in REAL_TIME_OPERATIONS
+    
+    def cancel(self):
+        """Mark the job as cancelled; the worker drops it or its result."""
+        self.cancel_token.set()
+    
+    def is_cancelled(self) -> bool:
+        """Check if the job has been cancelled."""
+        return self.cancel_token.is_set()
+
 class ImageProcessingWorker(QThread):
-    """Worker thread for image processing operations."""
+    """Long-lived worker thread that executes queued processing jobs."""
     
     # Signals for communication with main thread
-    finished = pyqtSignal(np.ndarray)  # Processed image
-    error = pyqtSignal(str)  # Error message
+    finished = pyqtSignal(int, np.ndarray)  # Job id, processed image (H×W×3, or H×W when monochrome)
+    error = pyqtSignal(int, str)  # Job id, error message
     progress = pyqtSignal(int)  # Progress percentage
     status_update = pyqtSignal(str)  # Status message
     
-    def __init__(self, image: np.ndarray, operation: str, **kwargs):
+    def __init__(self):
         super().__init__()
-        self.image = image.copy()
-        self.operation = operation
-        self.kwargs = kwargs
+        self._jobs = queue.Queue()
         self.processor = ImageProcessor()
+    
+    def submit(self, job: ProcessingJob):
+        """Queue a job for execution on the worker thread."""
+        self._jobs.put(job)
+    
+    def clear_pending(self):
+        """Drop queued jobs that have not started yet."""
+        with self._jobs.mutex:
+            for job in self._jobs.queue:
+                if job is not None:
+                    job.cancel()
+            self._jobs.queue.clear()
+    
+    def cancel_queued(self, operation: str):
+        """Cancel queued jobs of one operation, leaving the others to run."""
+        with self._jobs.mutex:
+            for job in self._jobs.queue:
+                if job is not None and job.operation == operation:
+                    job.cancel()
+    
+    def stop(self):
+        """Ask the worker loop to exit and wait for it."""
+        self.clear_pending()
+        self._jobs.put(None)
+        self.wait()
         
     def run(self):
-        """Execute the image processing operation."""
+        """Execute queued jobs until stopped."""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if job.is_cancelled():
+                continue
+            self._run_job(job)
+    
+    def _run_job(self, job: ProcessingJob):
+        """Execute a single image processing job."""
         try:
             # Real-time operations should be faster and less verbose
-            real_time_operations = ["brightness_contrast"]
-            is_real_time = self.operation in real_time_operations
+            is_real_time = job.is_real_time
             
             if not is_real_time:
-                self.status_update.emit(f"Starting {self.operation}...")
+                self.status_update.emit(f"Starting {job.operation}...")
                 self.progress.emit(10)
             
-            result = self._execute_operation()
+            result = self._execute_operation(job)
+            
+            if job.is_cancelled():
+                return
             
             if not is_real_time:
                 self.progress.emit(90)
-                self.status_update.emit(f"Finalizing {self.operation}...")
+                self.status_update.emit(f"Finalizing {job.operation}...")
             
             if result is not None:
                 if not is_real_time:
                     self.progress.emit(100)
-                    self.status_update.emit(f"{self.operation} completed successfully")
-                self.finished.emit(result)
+                    self.status_update.emit(f"{job.operation} completed successfully")
+                self.finished.emit(job.job_id, result)
             else:
-                self.error.emit(f"Failed to execute {self.operation}")
+                self.error.emit(job.job_id, f"Failed to execute {job.operation}")
                 
         except Exception as e:
-            error_msg = f"Error in {self.operation}: {str(e)}"
+            error_msg = f"Error in {job.operation}: {str(e)}"
             print(f"Worker error: {error_msg}")
             print(traceback.format_exc())
-            self.error.emit(error_msg)
+            self.error.emit(job.job_id, error_msg)
     
-    def _execute_operation(self) -> Optional[np.ndarray]:
+    def _execute_operation(self, job: ProcessingJob) -> Optional[np.ndarray]:
         """Execute the specific operation based on operation type."""
+        image = job.image
+        kwargs = job.kwargs
+        
         # Only emit progress for non-real-time operations
-        real_time_operations = ["brightness_contrast"]
-        if self.operation not in real_time_operations:
+        if not job.is_real_time:
             self.progress.emit(30)
         
-        if self.operation == "rotate":
-            angle = self.kwargs.get('angle', 0)
-            return self.processor.rotate_image(self.image, angle)
+        if job.operation == "rotate":
+            angle = kwargs.get('angle', 0)
+            return self.processor.rotate_image(image, angle)
             
-        elif self.operation == "crop":
-            x = self.kwargs.get('x', 0)
-            y = self.kwargs.get('y', 0)
-            width = self.kwargs.get('width', self.image.shape[1])
-            height = self.kwargs.get('height', self.image.shape[0])
-            return self.processor.crop_image(self.image, x, y, width, height)
+        elif job.operation == "crop":
+            x = kwargs.get('x', 0)
+            y = kwargs.get('y', 0)
+            width = kwargs.get('width', image.shape[1])
+            height = kwargs.get('height', image.shape[0])
+            return self.processor.crop_image(image, x, y, width, height)
             
-        elif self.operation == "flip":
-            horizontal = self.kwargs.get('horizontal', True)
-            return self.processor.flip_image(self.image, horizontal)
+        elif job.operation == "flip":
+            horizontal = kwargs.get('horizontal', True)
+            return self.processor.flip_image(image, horizontal)
             
-        elif self.operation == "brightness_contrast":
-            brightness = self.kwargs.get('brightness', 0)
-            contrast = self.kwargs.get('contrast', 1.0)
-            return self.processor.adjust_brightness_contrast(self.image, brightness, contrast)
+        elif job.operation == "brightness_contrast":
+            brightness = kwargs.get('brightness', 0)
+            contrast = kwargs.get('contrast', 1.0)
+            return self.processor.adjust_brightness_contrast(image, brightness, contrast)
             
-        elif self.operation == "sharpen":
-            method = self.kwargs.get('method', 'laplacian')
-            strength = self.kwargs.get('strength', 1.0)
-            return self.processor.sharpen_image(self.image, method, strength)
+        elif job.operation == "sharpen":
+            method = kwargs.get('method', 'laplacian')
+            strength = kwargs.get('strength', 1.0)
+            return self.processor.sharpen_image(image, method, strength)
             
-        elif self.operation == "add_noise":
-            noise_type = self.kwargs.get('noise_type', NoiseType.GAUSSIAN)
-            intensity = self.kwargs.get('intensity', 0.1)
-            return self.processor.add_noise(self.image, noise_type, intensity)
+        elif job.operation == "add_noise":
+            noise_type = kwargs.get('noise_type', NoiseType.GAUSSIAN)
+            intensity = kwargs.get('intensity', 0.1)
+            return self.processor.add_noise(image, noise_type, intensity)
             
-        elif self.operation == "blur":
-            blur_type = self.kwargs.get('blur_type', 'gaussian')
-            kernel_size = self.kwargs.get('kernel_size', 5)
-            return self.processor.blur_image(self.image, blur_type, kernel_size)
+        elif job.operation == "blur":
+            blur_type = kwargs.get('blur_type', 'gaussian')
+            kernel_size = kwargs.get('kernel_size', 5)
+            return self.processor.blur_image(image, blur_type, kernel_size)
             
-        elif self.operation == "filter":
-            filter_type = self.kwargs.get('filter_type', FilterType.GRAYSCALE)
-            return self.processor.apply_filter(self.image, filter_type)
+        elif job.operation == "filter":
+            filter_type = kwargs.get('filter_type', FilterType.GRAYSCALE)
+            to_rgb = kwargs.get('to_rgb', False)
+            return self.processor.apply_filter(image, filter_type, to_rgb)
             
-        elif self.operation == "resize":
-            width = self.kwargs.get('width', self.image.shape[1])
-            height = self.kwargs.get('height', self.image.shape[0])
-            maintain_aspect = self.kwargs.get('maintain_aspect', True)
-            return self.processor.resize_image(self.image, width, height, maintain_aspect)
+        elif job.operation == "resize":
+            width = kwargs.get('width', image.shape[1])
+            height = kwargs.get('height', image.shape[0])
+            maintain_aspect = kwargs.get('maintain_aspect', True)
+            quality = kwargs.get('quality', 'auto')
+            return self.processor.resize_image(image, width, height, maintain_aspect, quality)
+            
+        elif job.operation == "lut":
+            return self.processor.apply_lut(image, kwargs['lut'])
             
         else:
-            raise ValueError(f"Unknown operation: {self.operation}")
+            raise ValueError(f"Unknown operation: {job.operation}")
+
+class SaveImageSignals(QObject):
+    """Signal carrier for SaveImageTask."""
+    
+    finished = pyqtSignal(str, bool)  # file path, success
+
+class SaveImageTask(QRunnable):
+    """Encode and write an image on a thread pool so the GUI isn't blocked."""
+    
+    def __init__(self, image: np.ndarray, file_path: str):
+        super().__init__()
+        self.image = image
+        self.file_path = file_path
+        self.signals = SaveImageSignals()
+    
+    def run(self):
+        """Save the image and report the outcome."""
+        # save_image reports its own errors and returns False
+        success = ImageProcessor.save_image(self.image, self.file_path)
+        self.signals.finished.emit(self.file_path, bool(success))
+
+class SnapshotSignals(QObject):
+    """Signal carrier for SnapshotTask."""
+    
+    finished = pyqtSignal(object, str, bool)  # image, file path, success
+
+class SnapshotTask(QRunnable):
+    """Write an image's raw pixels to a file on a thread pool, for memory-mapping it afterwards."""
+    
+    def __init__(self, image: np.ndarray, file_path: str):
+        super().__init__()
+        self.image = image
+        self.file_path = file_path
+        self.signals = SnapshotSignals()
+    
+    def run(self):
+        """Write the pixels in C order and report the outcome."""
+        try:
+            self.image.tofile(self.file_path)
+            success = True
+        except OSError as e:
+            print(f"Error writing snapshot: {e}")
+            success = False
+        self.signals.finished.emit(self.image, self.file_path, success)
 
 class ThreadManager(QObject):
-    """Manages multiple worker threads and coordinates their execution."""
+    """Feeds jobs to a single long-lived worker thread and relays its results."""
     
     # Signals
-    processing_finished = pyqtSignal(np.ndarray)
+    processing_finished = pyqtSignal(np.ndarray)  # H×W×3, or H×W for monochrome filter results
     processing_error = pyqtSignal(str)
     processing_progress = pyqtSignal(int)
     processing_status = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
-        self.current_worker = None
-        self.operation_queue = []
+        self.worker = None
+        self.current_job = None
         self.is_processing = False
+        
+        # Latest real-time request received while busy (last write wins)
+        self._pending = None
+        self._pending_lock = threading.Lock()
+    
+    def _ensure_worker(self) -> ImageProcessingWorker:
+        """Create and start the worker thread on first use."""
+        if self.worker is None:
+            self.worker = ImageProcessingWorker()
+            self.worker.finished.connect(self._on_processing_finished)
+            self.worker.error.connect(self._on_processing_error)
+            self.worker.progress.connect(self.processing_progress.emit)
+            self.worker.status_update.connect(self.processing_status.emit)
+            
+            # Make sure the thread is joined before the application tears down Qt
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.shutdown)
+            
+            self.worker.start()
+        return self.worker
     
-    def process_image(self, image: np.ndarray, operation: str, **kwargs) -> bool:
-        """Start image processing in a separate thread."""
-        # For real-time operations, cancel current operation and start new one
-        real_time_operations = ["brightness_contrast"]
+    def process_image(self, image: np.ndarray, operation: str, supersede: bool = False, **kwargs) -> bool:
+        """Queue image processing on the worker thread.
         
+        With supersede=True a running job of the same operation is cancelled and
+        replaced, so only the newest value of an interactive adjustment is shown.
+        """
         if self.is_processing:
-            if operation in real_time_operations:
-                # Cancel current operation and start new one
-                self.cancel_current_operation()
+            if supersede and self.current_job is not None and self.current_job.operation == operation:
+                # The running job's result is dropped when it finishes; the new job queues behind it.
+                # Other work, like a coalesced real-time request in _pending, is left alone.
+                self.current_job.cancel()
+                self.worker.cancel_queued(operation)
+                return self._submit(image, operation, **kwargs)
+            if operation in REAL_TIME_OPERATIONS:
+                # Let the running job finish and keep only the newest request
+                with self._pending_lock:
+                    self._pending = (image, operation, kwargs)
+                return True
             else:
                 self.processing_error.emit("Another operation is already in progress")
                 return False
         
+        return self._submit(image, operation, **kwargs)
+    
+    def _submit(self, image: np.ndarray, operation: str, **kwargs) -> bool:
+        """Create a job and hand it to the worker thread."""
         try:
-            # Create and configure worker
-            self.current_worker = ImageProcessingWorker(image, operation, **kwargs)
-            
-            # Connect signals
-            self.current_worker.finished.connect(self._on_processing_finished)
-            self.current_worker.error.connect(self._on_processing_error)
-            self.current_worker.progress.connect(self.processing_progress.emit)
-            self.current_worker.status_update.connect(self.processing_status.emit)
-            
-            # Start processing
+            worker = self._ensure_worker()
+            self.current_job = ProcessingJob(image, operation, **kwargs)
             self.is_processing = True
-            self.current_worker.start()
+            worker.submit(self.current_job)
             return True
             
         except Exception as e:
             error_msg = f"Failed to start processing: {str(e)}"
             print(f"ThreadManager error: {error_msg}")
+            self.is_processing = False
             self.processing_error.emit(error_msg)
             return False
     
-    def _on_processing_finished(self, result: np.ndarray):
+    def _is_current(self, job_id: int) -> bool:
+        """Check whether a worker signal belongs to the job we are waiting on."""
+        return self.current_job is not None and self.current_job.job_id == job_id
+    
+    def _on_processing_finished(self, job_id: int, result: np.ndarray):
         """Handle successful completion of processing."""
+        if not self._is_current(job_id):
+            return  # Result of a superseded job
+        self.current_job = None
         self.is_processing = False
         self.processing_finished.emit(result)
-        self._cleanup_worker()
+        self._run_pending()
     
-    def _on_processing_error(self, error_msg: str):
+    def _on_processing_error(self, job_id: int, error_msg: str):
         """Handle processing errors."""
+        if not self._is_current(job_id):
+            return
+        self.current_job = None
         self.is_processing = False
         self.processing_error.emit(error_msg)
-        self._cleanup_worker()
+        self._run_pending()
     
-    def _cleanup_worker(self):
-        """Clean up the current worker thread."""
-        if self.current_worker:
-            self.current_worker.quit()
-            self.current_worker.wait()
-            self.current_worker.deleteLater()
-            self.current_worker = None
+    def _run_pending(self):
+        """Start the coalesced real-time request, if one arrived while busy."""
+        if self.is_processing:
+            return  # A slot already started new work; keep the request queued
+        with self._pending_lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            image, operation, kwargs = pending
+            self._submit(image, operation, **kwargs)
+    
+    def _cancel_jobs(self):
+        """Cancel the current job and drop anything still queued."""
+        with self._pending_lock:
+            self._pending = None
+        if self.current_job is not None:
+            self.current_job.cancel()
+            self.current_job = None
+        if self.worker is not None:
+            self.worker.clear_pending()
+        self.is_processing = False
     
     def is_busy(self) -> bool:
         """Check if a processing operation is currently running."""
@@ -189,12 +357,17 @@ class ThreadManager(QObject):
     
     def cancel_current_operation(self):
         """Cancel the current processing operation."""
-        if self.current_worker and self.current_worker.isRunning():
-            self.current_worker.terminate()
-            self.current_worker.wait()
-            self._cleanup_worker()
-            self.is_processing = False
+        if self.is_processing:
+            self._cancel_jobs()
             self.processing_status.emit("Operation cancelled")
+    
+    def shutdown(self):
+        """Stop the worker thread, discarding any pending work."""
+        self._cancel_jobs()
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker.deleteLater()
+            self.worker = None
 
 class BatchProcessor(QObject):
     """Handles batch processing of multiple operations."""
@@ -209,6 +382,7 @@ class BatchProcessor(QObject):
         self.operations_queue = []
         self.current_image = None
         self.current_operation_index = 0
+        self._fused_count = 1
         
         # Connect thread manager signals
         self.thread_manager.processing_finished.connect(self._on_operation_finished)
@@ -239,12 +413,25 @@ class BatchProcessor(QObject):
         progress = int((self.current_operation_index / len(self.operations_queue)) * 100)
         self.batch_progress.emit(progress, f"Processing: {operation_name}")
         
+        # Fuse a run of adjacent point operations into one LUT pass
+        self._fused_count = 1
+        lut = ImageProcessor.point_lut(operation_name, **operation_params)
+        if lut is not None:
+            for next_operation in self.operations_queue[self.current_operation_index + 1:]:
+                next_lut = ImageProcessor.point_lut(next_operation['name'], **next_operation.get('params', {}))
+                if next_lut is None:
+                    break
+                lut = next_lut[lut]
+                self._fused_count += 1
+            if self._fused_count > 1:
+                operation_name, operation_params = "lut", {'lut': lut}
+        
         self.thread_manager.process_image(self.current_image, operation_name, **operation_params)
     
     def _on_operation_finished(self, result: np.ndarray):
         """Handle completion of a single operation in the batch."""
         self.current_image = result
-        self.current_operation_index += 1
+        self.current_operation_index += self._fused_count
         self._process_next_operation()
     
     def _on_operation_error(self, error_msg: str):
@@ -4,31 +4,77 @@ Control panel for PixelWiz
 Provides sliders, buttons, and controls for various image processing operations.
 """
 
+import functools
+import time
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QSlider, QLabel,
     QPushButton, QComboBox, QSpinBox, QDoubleSpinBox, QCheckBox,
     QFrame, QScrollArea
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer
 from PyQt5.QtGui import QFont
 from src.core.image_processor import FilterType, NoiseType
 
+def throttle(interval_ms: int):
+    """Drop repeat calls with the same arguments that arrive within interval_ms."""
+    interval = interval_ms / 1000.0
+    
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            # Last accepted call time, kept per instance and per argument tuple
+            last_calls = self.__dict__.setdefault('_throttle_last_calls', {})
+            key = (func.__name__, args)
+            now = time.monotonic()
+            if now - last_calls.get(key, -interval) < interval:
+                return None
+            last_calls[key] = now
+            return func(self, *args)
+        return wrapper
+    return decorator
+
 class SliderGroup(QWidget):
     """Custom widget for labeled sliders."""
     
     value_changed = pyqtSignal(int)
     value_changed_debounced = pyqtSignal(int)  # Debounced signal for real-time processing
     
+    # One debounce timer shared by every instance, flushing all pending values at once
+    _shared_timer = None
+    _pending = {}
+    
+    @classmethod
+    def _debounce_timer(cls) -> QTimer:
+        """Get the shared debounce timer, creating it once the app exists."""
+        if cls._shared_timer is None:
+            cls._shared_timer = QTimer()
+            cls._shared_timer.setSingleShot(True)
+            cls._shared_timer.timeout.connect(cls._flush_debounced)
+        return cls._shared_timer
+    
+    @classmethod
+    def _flush_debounced(cls):
+        """Emit the debounced signal for every slider that changed."""
+        pending = cls._pending
+        cls._pending = {}
+        for group, value in pending.items():
+            group.value_changed_debounced.emit(value)
+    
     def __init__(self, label: str, minimum: int, maximum: int, default: int = 0, debounce_delay: int = 300):
         super().__init__()
         
-        # Debouncing timer
-        self.debounce_timer = QTimer()
-        self.debounce_timer.setSingleShot(True)
-        self.debounce_timer.timeout.connect(self._emit_debounced_signal)
+        # Debouncing goes through the class-wide timer
         self.debounce_delay = debounce_delay
         self.last_value = default
         
+        # Throttle timer, at most one value_changed per frame while dragging
+        self.throttle_timer = QTimer()
+        self.throttle_timer.setSingleShot(True)
+        self.throttle_timer.setInterval(16)
+        self.throttle_timer.timeout.connect(self._emit_throttled_signal)
+        self._throttle_dirty = False
+        
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         
@@ -36,8 +82,13 @@ class SliderGroup(QWidget):
         self.label = QLabel(label)
         layout.addWidget(self.label)
         
+        # Every label the slider can show, indexed by value - minimum
+        self._minimum = minimum
+        self._label_cache = tuple(str(i) for i in range(minimum, maximum + 1))
+        self._last_text = str(default)
+        
         # Value display
-        self.value_label = QLabel(str(default))
+        self.value_label = QLabel(self._last_text)
         self.value_label.setAlignment(Qt.AlignCenter)
         self.value_label.setMinimumWidth(40)
         layout.addWidget(self.value_label)
@@ -52,21 +103,50 @@ class SliderGroup(QWidget):
     
     def _on_value_changed(self, value: int):
         """Handle slider value change."""
-        self.value_label.setText(str(value))
-        self.value_changed.emit(value)
+        text = self._label_cache[value - self._minimum]
+        if text != self._last_text:
+            self._last_text = text
+            self.value_label.setText(text)
         
         # Start/restart debouncing timer for real-time processing
         self.last_value = value
-        self.debounce_timer.stop()
-        self.debounce_timer.start(self.debounce_delay)
+        self.__class__._pending[self] = value
+        self._debounce_timer().start(self.debounce_delay)
+        
+        # Leading edge emits now, later ticks are held for the trailing edge
+        if self.throttle_timer.isActive():
+            self._throttle_dirty = True
+        else:
+            self.value_changed.emit(value)
+            self.throttle_timer.start()
     
-    def _emit_debounced_signal(self):
-        """Emit the debounced signal after delay."""
-        self.value_changed_debounced.emit(self.last_value)
+    def _emit_throttled_signal(self):
+        """Emit the latest value held back by the throttle."""
+        if self._throttle_dirty:
+            self._throttle_dirty = False
+            self.value_changed.emit(self.last_value)
+            self.throttle_timer.start()
+    
+    def _set_silently(self, value: int):
+        """Move the slider without emitting any change signals."""
+        self.slider.blockSignals(True)
+        self.slider.setValue(value)
+        self.slider.blockSignals(False)
+        
+        value = self.slider.value()
+        text = self._label_cache[value - self._minimum]
+        if text != self._last_text:
+            self._last_text = text
+            self.value_label.setText(text)
+        
+        # Drop anything still waiting on the throttle/debounce timers
+        self.last_value = value
+        self._throttle_dirty = False
+        self.__class__._pending.pop(self, None)
     
     def set_value(self, value: int):
         """Set slider value."""
-        self.slider.setValue(value)
+        self._set_silently(value)
     
     def get_value(self) -> int:
         """Get slider value."""
@@ -77,7 +157,7 @@ class SliderGroup(QWidget):
         default_value = 0
         if hasattr(self, '_default_value'):
             default_value = self._default_value
-        self.slider.setValue(default_value)
+        self._set_silently(default_value)
 
 class DoubleSliderGroup(QWidget):
     """Custom widget for labeled double precision sliders."""
@@ -85,19 +165,44 @@ class DoubleSliderGroup(QWidget):
     value_changed = pyqtSignal(float)
     value_changed_debounced = pyqtSignal(float)  # Debounced signal for real-time processing
     
+    # One debounce timer shared by every instance, flushing all pending values at once
+    _shared_timer = None
+    _pending = {}
+    
+    @classmethod
+    def _debounce_timer(cls) -> QTimer:
+        """Get the shared debounce timer, creating it once the app exists."""
+        if cls._shared_timer is None:
+            cls._shared_timer = QTimer()
+            cls._shared_timer.setSingleShot(True)
+            cls._shared_timer.timeout.connect(cls._flush_debounced)
+        return cls._shared_timer
+    
+    @classmethod
+    def _flush_debounced(cls):
+        """Emit the debounced signal for every slider that changed."""
+        pending = cls._pending
+        cls._pending = {}
+        for group, value in pending.items():
+            group.value_changed_debounced.emit(value)
+    
     def __init__(self, label: str, minimum: float, maximum: float, default: float = 0.0, decimals: int = 2, debounce_delay: int = 300):
         super().__init__()
         
         self.decimals = decimals
         self.multiplier = 10 ** decimals
         
-        # Debouncing timer
-        self.debounce_timer = QTimer()
-        self.debounce_timer.setSingleShot(True)
-        self.debounce_timer.timeout.connect(self._emit_debounced_signal)
+        # Debouncing goes through the class-wide timer
         self.debounce_delay = debounce_delay
         self.last_value = default
         
+        # Throttle timer, at most one value_changed per frame while dragging
+        self.throttle_timer = QTimer()
+        self.throttle_timer.setSingleShot(True)
+        self.throttle_timer.setInterval(16)
+        self.throttle_timer.timeout.connect(self._emit_throttled_signal)
+        self._throttle_dirty = False
+        
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         
@@ -105,8 +210,15 @@ class DoubleSliderGroup(QWidget):
         self.label = QLabel(label)
         layout.addWidget(self.label)
         
+        # Real value and label for every slider position
+        self._value_table = {
+            i: (i / self.multiplier, f"{i / self.multiplier:.{decimals}f}")
+            for i in range(int(minimum * self.multiplier), int(maximum * self.multiplier) + 1)
+        }
+        self._last_text = f"{default:.{decimals}f}"
+        
         # Value display
-        self.value_label = QLabel(f"{default:.{decimals}f}")
+        self.value_label = QLabel(self._last_text)
         self.value_label.setAlignment(Qt.AlignCenter)
         self.value_label.setMinimumWidth(50)
         layout.addWidget(self.value_label)
@@ -123,33 +235,64 @@ class DoubleSliderGroup(QWidget):
     
     def _on_value_changed(self, value: int):
         """Handle slider value change."""
-        real_value = value / self.multiplier
-        self.value_label.setText(f"{real_value:.{self.decimals}f}")
-        self.value_changed.emit(real_value)
+        real_value, text = self._value_table[value]
+        if text != self._last_text:
+            self._last_text = text
+            self.value_label.setText(text)
         
         # Start/restart debouncing timer for real-time processing
         self.last_value = real_value
-        self.debounce_timer.stop()
-        self.debounce_timer.start(self.debounce_delay)
+        self.__class__._pending[self] = real_value
+        self._debounce_timer().start(self.debounce_delay)
+        
+        # Leading edge emits now, later ticks are held for the trailing edge
+        if self.throttle_timer.isActive():
+            self._throttle_dirty = True
+        else:
+            self.value_changed.emit(real_value)
+            self.throttle_timer.start()
     
-    def _emit_debounced_signal(self):
-        """Emit the debounced signal after delay."""
-        self.value_changed_debounced.emit(self.last_value)
+    def _emit_throttled_signal(self):
+        """Emit the latest value held back by the throttle."""
+        if self._throttle_dirty:
+            self._throttle_dirty = False
+            self.value_changed.emit(self.last_value)
+            self.throttle_timer.start()
+    
+    def _set_silently(self, value: int):
+        """Move the slider without emitting any change signals."""
+        self.slider.blockSignals(True)
+        self.slider.setValue(value)
+        self.slider.blockSignals(False)
+        
+        real_value, text = self._value_table[self.slider.value()]
+        if text != self._last_text:
+            self._last_text = text
+            self.value_label.setText(text)
+        
+        # Drop anything still waiting on the throttle/debounce timers
+        self.last_value = real_value
+        self._throttle_dirty = False
+        self.__class__._pending.pop(self, None)
     
     def set_value(self, value: float):
         """Set slider value."""
-        self.slider.setValue(int(value * self.multiplier))
+        self._set_silently(int(value * self.multiplier))
     
     def get_value(self) -> float:
         """Get slider value."""
-        return self.slider.value() / self.multiplier
+        return self._value_table[self.slider.value()][0]
     
     def reset(self):
         """Reset slider to default value."""
-        self.slider.setValue(int(self._default_value * self.multiplier))
+        self._set_silently(int(self._default_value * self.multiplier))
 
 class ControlPanel(QWidget):
-    """Main control panel with all image processing controls."""
+    """Main control panel with all image processing controls.
+    
+    Lives on the GUI thread and only emits requests; the processing itself runs on the
+    ThreadManager worker, and the signals below are delivered queued so emits return at once.
+    """
     
     # Signals for real-time updates
     brightness_changed = pyqtSignal(int)
@@ -159,6 +302,16 @@ class ControlPanel(QWidget):
     noise_requested = pyqtSignal(object, float)  # NoiseType, intensity
     filter_requested = pyqtSignal(object)  # FilterType
     
+    # Filter buttons by object name
+    _filter_map = {
+        "grayscale": FilterType.GRAYSCALE,
+        "sepia": FilterType.SEPIA,
+        "invert": FilterType.INVERT,
+        "sobel": FilterType.SOBEL_EDGE,
+        "canny": FilterType.CANNY_EDGE,
+        "emboss": FilterType.EMBOSS,
+    }
+    
     def __init__(self):
         super().__init__()
         
@@ -171,6 +324,13 @@ class ControlPanel(QWidget):
     
     def init_ui(self):
         """Initialize the user interface."""
+        # Hold repaints until the visible part of the panel is fully built
+        self.setUpdatesEnabled(False)
+        
+        # One stylesheet for the whole panel, widgets opt in through their object name
+        self.setStyleSheet("QLabel#sectionHeader { font-weight: bold; } "
+                           "QPushButton#primary { font-weight: bold; }")
+        
         # Create scroll area for the controls
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
@@ -203,27 +363,44 @@ class ControlPanel(QWidget):
         separator.setFrameShadow(QFrame.Sunken)
         layout.addWidget(separator)
         
-        # Brightness and Contrast group
+        # Brightness and Contrast group, the only one visible on first paint
         self.create_brightness_contrast_group(layout)
         
-        # Blur and Sharpen group
-        self.create_blur_sharpen_group(layout)
-        
-        # Filters group
-        self.create_filters_group(layout)
-        
-        # Noise group
-        self.create_noise_group(layout)
-        
-        # Advanced group
-        self.create_advanced_group(layout)
-        
-        # Add stretch to push everything to top
-        layout.addStretch()
+        # Blur/sharpen, filters, noise and advanced groups are built after show(),
+        # one per event loop pass
+        self._controls_layout = layout
+        self._pending_groups = [
+            self.create_blur_sharpen_group,
+            self.create_filters_group,
+            self.create_noise_group,
+            self.create_advanced_group,
+        ]
+        QTimer.singleShot(0, self._build_next_group)
+        
+        self.setUpdatesEnabled(True)
+        self.updateGeometry()
+    
+    def _build_next_group(self):
+        """Build the next deferred group and schedule the one after it."""
+        if not self._pending_groups:
+            return
+        
+        self._pending_groups.pop(0)(self._controls_layout)
+        if self._pending_groups:
+            QTimer.singleShot(0, self._build_next_group)
+        else:
+            # Add stretch to push everything to top
+            self._controls_layout.addStretch()
+    
+    def _build_remaining_groups(self):
+        """Build every group that has not been created yet."""
+        while self._pending_groups:
+            self._build_next_group()
     
     def create_brightness_contrast_group(self, parent_layout):
         """Create brightness and contrast controls."""
         group = QGroupBox("Brightness & Contrast")
+        group.setUpdatesEnabled(False)
         layout = QVBoxLayout(group)
         
         # Brightness slider
@@ -240,15 +417,17 @@ class ControlPanel(QWidget):
         layout.addWidget(reset_btn)
         
         parent_layout.addWidget(group)
+        group.setUpdatesEnabled(True)
     
     def create_blur_sharpen_group(self, parent_layout):
         """Create blur and sharpen controls."""
         group = QGroupBox("Blur & Sharpen")
+        group.setUpdatesEnabled(False)
         layout = QVBoxLayout(group)
         
         # Blur section
         blur_label = QLabel("Blur")
-        blur_label.setStyleSheet("font-weight: bold;")
+        blur_label.setObjectName("sectionHeader")
         layout.addWidget(blur_label)
         
         # Blur type combo
@@ -272,7 +451,7 @@ class ControlPanel(QWidget):
         
         # Sharpen section
         sharpen_label = QLabel("Sharpen")
-        sharpen_label.setStyleSheet("font-weight: bold;")
+        sharpen_label.setObjectName("sectionHeader")
         layout.addWidget(sharpen_label)
         
         # Sharpen method combo
@@ -290,30 +469,35 @@ class ControlPanel(QWidget):
         layout.addWidget(apply_sharpen_btn)
         
         parent_layout.addWidget(group)
+        group.setUpdatesEnabled(True)
     
     def create_filters_group(self, parent_layout):
         """Create filters controls."""
         group = QGroupBox("Filters")
+        group.setUpdatesEnabled(False)
         layout = QVBoxLayout(group)
         
         # Color filters
         color_label = QLabel("Color Effects")
-        color_label.setStyleSheet("font-weight: bold;")
+        color_label.setObjectName("sectionHeader")
         layout.addWidget(color_label)
         
         filters_layout = QVBoxLayout()
         
         # Filter buttons
         grayscale_btn = QPushButton("Grayscale")
-        grayscale_btn.clicked.connect(lambda: self.filter_requested.emit(FilterType.GRAYSCALE))
+        grayscale_btn.setObjectName("grayscale")
+        grayscale_btn.clicked.connect(self._on_filter_clicked)
         filters_layout.addWidget(grayscale_btn)
         
         sepia_btn = QPushButton("Sepia")
-        sepia_btn.clicked.connect(lambda: self.filter_requested.emit(FilterType.SEPIA))
+        sepia_btn.setObjectName("sepia")
+        sepia_btn.clicked.connect(self._on_filter_clicked)
         filters_layout.addWidget(sepia_btn)
         
         invert_btn = QPushButton("Invert")
-        invert_btn.clicked.connect(lambda: self.filter_requested.emit(FilterType.INVERT))
+        invert_btn.setObjectName("invert")
+        invert_btn.clicked.connect(self._on_filter_clicked)
         filters_layout.addWidget(invert_btn)
         
         layout.addLayout(filters_layout)
@@ -325,30 +509,35 @@ class ControlPanel(QWidget):
         
         # Edge detection
         edge_label = QLabel("Edge Detection")
-        edge_label.setStyleSheet("font-weight: bold;")
+        edge_label.setObjectName("sectionHeader")
         layout.addWidget(edge_label)
         
         edge_layout = QVBoxLayout()
         
         sobel_btn = QPushButton("Sobel")
-        sobel_btn.clicked.connect(lambda: self.filter_requested.emit(FilterType.SOBEL_EDGE))
+        sobel_btn.setObjectName("sobel")
+        sobel_btn.clicked.connect(self._on_filter_clicked)
         edge_layout.addWidget(sobel_btn)
         
         canny_btn = QPushButton("Canny")
-        canny_btn.clicked.connect(lambda: self.filter_requested.emit(FilterType.CANNY_EDGE))
+        canny_btn.setObjectName("canny")
+        canny_btn.clicked.connect(self._on_filter_clicked)
         edge_layout.addWidget(canny_btn)
         
         emboss_btn = QPushButton("Emboss")
-        emboss_btn.clicked.connect(lambda: self.filter_requested.emit(FilterType.EMBOSS))
+        emboss_btn.setObjectName("emboss")
+        emboss_btn.clicked.connect(self._on_filter_clicked)
         edge_layout.addWidget(emboss_btn)
         
         layout.addLayout(edge_layout)
         
         parent_layout.addWidget(group)
+        group.setUpdatesEnabled(True)
     
     def create_noise_group(self, parent_layout):
         """Create noise controls."""
         group = QGroupBox("Noise")
+        group.setUpdatesEnabled(False)
         layout = QVBoxLayout(group)
         
         # Noise type combo
@@ -366,25 +555,29 @@ class ControlPanel(QWidget):
         layout.addWidget(apply_noise_btn)
         
         parent_layout.addWidget(group)
+        group.setUpdatesEnabled(True)
     
     def create_advanced_group(self, parent_layout):
         """Create advanced controls."""
         group = QGroupBox("Advanced")
+        group.setUpdatesEnabled(False)
         layout = QVBoxLayout(group)
         
         # Reset all button
         reset_all_btn = QPushButton("Reset All Controls")
-        reset_all_btn.setStyleSheet("QPushButton { font-weight: bold; }")
+        reset_all_btn.setObjectName("primary")
         reset_all_btn.clicked.connect(self.reset_all_controls)
         layout.addWidget(reset_all_btn)
         
         parent_layout.addWidget(group)
+        group.setUpdatesEnabled(True)
     
     def connect_signals(self):
         """Connect control signals."""
         # Real-time updates for brightness and contrast (debounced to prevent too many operations)
-        self.brightness_slider.value_changed_debounced.connect(self.brightness_changed.emit)
-        self.contrast_slider.value_changed_debounced.connect(self.contrast_changed.emit)
+        # Queued so the debounce flush returns before any processing is kicked off
+        self.brightness_slider.value_changed_debounced.connect(self.brightness_changed, Qt.QueuedConnection)
+        self.contrast_slider.value_changed_debounced.connect(self.contrast_changed, Qt.QueuedConnection)
     
     def get_brightness(self) -> int:
         """Get current brightness value."""
@@ -398,7 +591,23 @@ class ControlPanel(QWidget):
         """Reset brightness and contrast to default values."""
         self.brightness_slider.reset()
         self.contrast_slider.reset()
+        
+        # Resets are silent, so request the update once here
+        self.brightness_changed.emit(self.get_brightness())
+        self.contrast_changed.emit(self.get_contrast())
     
+    @pyqtSlot()
+    def _on_filter_clicked(self):
+        """Request the filter for whichever filter button was clicked."""
+        self._emit_filter(self._filter_map[self.sender().objectName()])
+    
+    @throttle(250)
+    def _emit_filter(self, filter_type: FilterType):
+        """Request a filter, ignoring repeat clicks."""
+        self.filter_requested.emit(filter_type)
+    
+    @pyqtSlot()
+    @throttle(250)
     def apply_blur(self):
         """Apply blur with current settings."""
         blur_type = self.blur_type_combo.currentText().lower()
@@ -410,6 +619,8 @@ class ControlPanel(QWidget):
         
         self.blur_changed.emit(blur_type, intensity)
     
+    @pyqtSlot()
+    @throttle(250)
     def apply_sharpen(self):
         """Apply sharpening with current settings."""
         method = self.sharpen_method_combo.currentText().lower().replace(" ", "_")
@@ -417,6 +628,8 @@ class ControlPanel(QWidget):
         
         self.sharpen_changed.emit(method, strength)
     
+    @pyqtSlot()
+    @throttle(250)
     def apply_noise(self):
         """Apply noise with current settings."""
         noise_type_text = self.noise_type_combo.currentText()
@@ -429,8 +642,11 @@ class ControlPanel(QWidget):
         self.noise_requested.emit(noise_type, intensity)
     
     def reset_controls(self):
-        """Reset all controls to default values."""
-        self.reset_brightness_contrast()
+        """Reset all controls to default values without emitting signals."""
+        self._build_remaining_groups()
+        
+        self.brightness_slider.reset()
+        self.contrast_slider.reset()
         self.blur_intensity.reset()
         self.sharpen_strength.reset()
         self.noise_intensity.reset()
@@ -4,15 +4,12 @@ Dialog boxes for PixelWiz
 Provides specialized dialogs for crop, rotate, resize, and other operations.
 """
 
-import numpy as np
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QSpinBox, QDoubleSpinBox, QCheckBox, QGroupBox, QGridLayout,
     QDialogButtonBox, QFrame, QSlider, QWidget
 )
 from PyQt5.QtCore import Qt, QRect
-from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor
-from src.utils.image_utils import numpy_to_qpixmap, scale_pixmap_to_fit
 
 class CropDialog(QDialog):
     """Dialog for visual crop selection."""
@@ -22,6 +19,7 @@ class CropDialog(QDialog):
         
         self.image_viewer = image_viewer
         self.crop_rect = QRect(0, 0, 0, 0)
+        self._last_selection_key = None  # (selection, zoom) last shown in the info label
         
         self.setWindowTitle("Crop Image")
         self.setModal(False)  # Make non-modal to allow interaction with main window
@@ -90,6 +88,12 @@ class CropDialog(QDialog):
     
     def on_crop_selection_changed(self, selection: QRect):
         """Handle crop selection changes."""
+        # Mouse moves re-emit the same rectangle; skip the label rebuild when nothing changed
+        key = (QRect(selection), self.image_viewer.get_zoom_factor())
+        if key == self._last_selection_key:
+            return
+        self._last_selection_key = key
+        
         if self.image_viewer.has_crop_selection():
             info = self.image_viewer.get_crop_selection_info()
             self.selection_info.setText(
@@ -141,26 +145,9 @@ class CropDialog(QDialog):
         if self.image_viewer.image_label.original_pixmap.isNull():
             return
         
-        # Calculate scale factor
-        original_width = self.image_viewer.image_label.original_pixmap.width()
-        original_height = self.image_viewer.image_label.original_pixmap.height()
-        display_width = self.image_viewer.image_label.scaled_pixmap.width()
-        display_height = self.image_viewer.image_label.scaled_pixmap.height()
-        
-        scale_x = display_width / original_width
-        scale_y = display_height / original_height
-        
-        # Convert to display coordinates
-        display_x = int(x * scale_x)
-        display_y = int(y * scale_y)
-        display_width = int(width * scale_x)
-        display_height = int(height * scale_y)
-        
-        # Set the crop selection
-        crop_rect = QRect(display_x, display_y, display_width, display_height)
-        self.image_viewer.image_label.crop_selection = crop_rect
-        self.image_viewer.image_label.crop_rubber_band.setGeometry(crop_rect)
-        self.image_viewer.image_label.crop_rubber_band.show()
+        # Convert to display coordinates and set the crop selection
+        crop_rect = self.image_viewer.image_label.image_rect_to_display(x, y, width, height)
+        self.image_viewer.image_label.set_crop_rect(crop_rect)
         
         # Update the info
         self.on_crop_selection_changed(crop_rect)
@@ -258,6 +245,7 @@ class ResizeDialog(QDialog):
         self.current_width = current_width
         self.current_height = current_height
         self.aspect_ratio = current_width / current_height
+        self._inv_aspect = current_height / current_width  # height per unit of width
         
         self.setWindowTitle("Resize Image")
         self.setModal(True)
@@ -330,7 +318,7 @@ class ResizeDialog(QDialog):
     def on_width_changed(self, width: int):
         """Handle width change."""
         if self.maintain_aspect_checkbox.isChecked():
-            new_height = int(width / self.aspect_ratio)
+            new_height = int(width * self._inv_aspect)
             self.height_spinbox.blockSignals(True)
             self.height_spinbox.setValue(new_height)
             self.height_spinbox.blockSignals(False)
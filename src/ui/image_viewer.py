@@ -4,11 +4,53 @@ Image viewer widget for PixelWiz
 Provides image display with zoom, pan, and crop selection functionality.
 """
 
+import os
 import numpy as np
-from PyQt5.QtWidgets import QWidget, QScrollArea, QLabel, QVBoxLayout, QRubberBand
-from PyQt5.QtCore import Qt, QRect, QPoint, pyqtSignal
-from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor, QWheelEvent, QMouseEvent
-from src.utils.image_utils import numpy_to_qpixmap, scale_pixmap_to_fit, calculate_zoom_to_fit, clamp_value
+from PyQt5.QtWidgets import QWidget, QScrollArea, QLabel, QVBoxLayout
+from PyQt5.QtCore import Qt, QRect, QRectF, QPoint, QSize, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap, QPixmapCache, QPainter, QPen, QColor, QWheelEvent, QMouseEvent
+from typing import List, Optional
+from src.utils._crop_math import map_rect
+from src.utils.image_utils import numpy_to_qpixmap, numpy_to_qpixmap_scaled, find_cached_qpixmap, cache_qpixmap, scale_pixmap_to_fit, calculate_zoom_to_fit, build_pyramid, load_reduced, HAS_BGR888
+
+# Images larger than this are converted to a pixmap on the thread pool
+ASYNC_CONVERT_PIXELS = 4_000_000
+
+def _wrap_qimage(image: np.ndarray) -> QImage:
+    """Wrap a uint8 BGR or grayscale array in a QImage without copying its pixels."""
+    height, width = image.shape[:2]
+    if image.ndim == 2:
+        return QImage(image.data, width, height, image.strides[0], QImage.Format_Grayscale8)
+    if not HAS_BGR888:
+        # Older Qt: the swap makes a copy, so the zero-copy guarantee only holds with BGR888
+        return QImage(image.data, width, height, image.strides[0], QImage.Format_RGB888).rgbSwapped()
+    return QImage(image.data, width, height, image.strides[0], QImage.Format_BGR888)
+
+class _PixmapConvertSignals(QObject):
+    """Signal carrier for _PixmapConvertTask."""
+    
+    finished = pyqtSignal(int, QImage, list)  # generation, converted image, half-size mip levels
+
+class _PixmapConvertTask(QRunnable):
+    """Convert an array into a display-ready QImage off the GUI thread."""
+    
+    def __init__(self, image: np.ndarray, generation: int):
+        super().__init__()
+        self.image = image
+        self.generation = generation
+        self.signals = _PixmapConvertSignals()
+    
+    def run(self):
+        """Convert the image, build its mip levels and emit them with the generation."""
+        buffer = np.ascontiguousarray(self.image)
+        
+        # QPixmap is GUI-thread only, so do the format conversion here and leave fromImage a plain copy
+        q_image = _wrap_qimage(buffer).convertToFormat(QImage.Format_RGB32)
+        
+        # Half-size levels for ImageLabel's mip chain, which would otherwise be scaled on the GUI thread
+        levels = [_wrap_qimage(level).convertToFormat(QImage.Format_RGB32)
+                  for level in build_pyramid(buffer, min_size=256)[1:]]
+        self.signals.finished.emit(self.generation, q_image, levels)
 
 class ImageLabel(QLabel):
     """Custom QLabel for image display with zoom and pan functionality."""
@@ -23,14 +65,46 @@ class ImageLabel(QLabel):
         # Image properties
         self.original_pixmap = QPixmap()
         self.scaled_pixmap = QPixmap()
+        self._mip_chain = []  # original_pixmap followed by successive half-size copies
+        self.image_size = QSize()  # full image size; original_pixmap may be a smaller preview
+        self.display_size = QSize()  # size of the image as shown on screen
+        self._paint_from_source = False  # zoom > 1: paintEvent draws from original_pixmap
+        self._smooth_paint = True
+        
+        # Display <-> image coordinate scales, refreshed whenever display_size changes
+        self._disp_to_img_x = self._disp_to_img_y = 1.0
+        self._img_to_disp_x = self._img_to_disp_y = 1.0
+        self._disp_to_src_x = self._disp_to_src_y = 1.0
         self.zoom_factor = 1.0
         self.min_zoom = 0.1
         self.max_zoom = 10.0
         
+        # Interactive zooms show a fast scale first, refined with smooth scaling once idle
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.timeout.connect(self._refine_display)
+        
+        # Wheel zoom steps collected over one frame and applied together
+        self._pending_zoom_mul = 1.0
+        self._zoom_flush_timer = QTimer(self)
+        self._zoom_flush_timer.setSingleShot(True)
+        self._zoom_flush_timer.timeout.connect(self._flush_zoom)
+        
+        # Scroll area this label sits in, set by ImageViewer
+        self._scroll_area_ref = None
+        
         # Pan properties
         self.pan_start_point = QPoint()
         self.pan_active = False
         self.last_pan_point = QPoint()
+        
+        # Pan movement collected between frames and applied to the scroll bars together
+        self._pan_dx = 0
+        self._pan_dy = 0
+        self._pan_timer = QTimer(self)
+        self._pan_timer.setSingleShot(True)
+        self._pan_timer.setInterval(16)
+        self._pan_timer.timeout.connect(self._flush_pan)
         self.image_offset = QPoint(0, 0)
         
         # Crop selection properties
@@ -38,13 +112,18 @@ class ImageLabel(QLabel):
         self.crop_start_point = QPoint()
         self.crop_end_point = QPoint()
         self.crop_selection = QRect()
-        self.crop_rubber_band = QRubberBand(QRubberBand.Rectangle, self)
-        self.crop_rubber_band.setStyleSheet("""
-            QRubberBand {
-                border: 2px dashed #FF6B6B;
-                background-color: rgba(255, 107, 107, 30);
-            }
-        """)
+        
+        # Crop rectangle is drawn by paintEvent with a pen and brush built once
+        self._crop_pen = QPen(QColor(255, 107, 107))
+        self._crop_pen.setStyle(Qt.DashLine)
+        self._crop_pen.setWidth(2)
+        self._crop_brush = QColor(255, 107, 107, 30)
+        
+        # Selection updates during a drag go out at most once per frame
+        self._crop_emit_timer = QTimer(self)
+        self._crop_emit_timer.setSingleShot(True)
+        self._crop_emit_timer.setInterval(16)
+        self._crop_emit_timer.timeout.connect(self._emit_crop_selection)
         
         # Widget properties
         self.setMinimumSize(200, 200)
@@ -57,20 +136,57 @@ class ImageLabel(QLabel):
         if image is None:
             self.original_pixmap = QPixmap()
             self.scaled_pixmap = QPixmap()
+            self._mip_chain = []
+            self.image_size = QSize()
+            self.display_size = QSize()
+            self._paint_from_source = False
+            self.setAttribute(Qt.WA_OpaquePaintEvent, False)
             self.clear()
             self.setText("No Image Loaded")
             self.setCursor(Qt.ArrowCursor)
             return
         
         # Convert numpy array to QPixmap
-        self.original_pixmap = numpy_to_qpixmap(image)
-        self.reset_view()
+        self.set_pixmap(numpy_to_qpixmap(image))
+    
+    def set_pixmap(self, pixmap: QPixmap, image_size: Optional[QSize] = None,
+                   mip_levels: Optional[List[QPixmap]] = None, keep_view: bool = False):
+        """Set an already converted image to display.
+        
+        image_size is the size of the image the pixmap stands for (a preview may be
+        smaller); zoom, fit and crop coordinates all refer to it. mip_levels are
+        prebuilt half-size copies, and keep_view keeps the current zoom and scroll.
+        """
+        self.original_pixmap = pixmap
+        self.image_size = QSize(image_size) if image_size is not None else pixmap.size()
+        if mip_levels is None:
+            self._build_mip_chain()
+        else:
+            self._mip_chain = [pixmap] + mip_levels
+        if not keep_view:
+            self.reset_view()
         self.update_display()
         
         # Set appropriate cursor
         if not self.crop_mode:
             self.setCursor(Qt.OpenHandCursor)
     
+    def _build_mip_chain(self):
+        """Downsample the original pixmap into half-size levels for zoomed-out display."""
+        self._mip_chain = [self.original_pixmap]
+        level = self.original_pixmap
+        while level.width() > 256 and level.height() > 256:
+            level = level.scaled(level.width() // 2, level.height() // 2,
+                                 Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self._mip_chain.append(level)
+    
+    def _mip_source(self, target_width: float) -> QPixmap:
+        """Get the smallest mip level that is still about as wide as the target."""
+        for level in reversed(self._mip_chain):
+            if level.width() >= target_width * 0.9:
+                return level
+        return self.original_pixmap
+    
     def reset_view(self):
         """Reset zoom and pan to default values."""
         self.zoom_factor = 1.0
@@ -93,56 +209,167 @@ class ImageLabel(QLabel):
             widget_size = (self.size().width(), self.size().height())
         
         # Calculate zoom to fit
-        image_size = (self.original_pixmap.width(), self.original_pixmap.height())
+        image_size = (self.image_size.width(), self.image_size.height())
         zoom = calculate_zoom_to_fit(image_size, widget_size)
         self.set_zoom(zoom)
     
-    def set_zoom(self, zoom_factor: float):
+    def set_zoom(self, zoom_factor: float, interactive: bool = False):
         """Set zoom factor and update display."""
-        self.zoom_factor = clamp_value(zoom_factor, self.min_zoom, self.max_zoom)
-        self.update_display()
+        # Inline clamp; this runs for every wheel and zoom step
+        if zoom_factor < self.min_zoom:
+            zoom_factor = self.min_zoom
+        elif zoom_factor > self.max_zoom:
+            zoom_factor = self.max_zoom
+        
+        # Already showing this zoom (e.g. a repeated fit-to-window), nothing to rescale
+        if abs(zoom_factor - self.zoom_factor) < 1e-3:
+            return
+        
+        self.zoom_factor = zoom_factor
+        self.update_display(fast=interactive)
         self.zoom_changed.emit(self.zoom_factor)
     
     def zoom_in(self, factor: float = 1.2):
         """Zoom in by specified factor."""
-        self.set_zoom(self.zoom_factor * factor)
+        self.set_zoom(self.zoom_factor * factor, interactive=True)
     
     def zoom_out(self, factor: float = 1.2):
         """Zoom out by specified factor."""
-        self.set_zoom(self.zoom_factor / factor)
+        self.set_zoom(self.zoom_factor / factor, interactive=True)
     
     def zoom_to_actual_size(self):
         """Zoom to actual image size (100%)."""
         self.set_zoom(1.0)
     
-    def update_display(self):
-        """Update the displayed image."""
+    def update_display(self, fast: bool = False):
+        """Update the displayed image, using a quick nearest-neighbour scale if fast is set."""
         if self.original_pixmap.isNull():
             return
         
-        # Scale pixmap according to zoom factor
-        scaled_size = self.original_pixmap.size() * self.zoom_factor
-        self.scaled_pixmap = self.original_pixmap.scaled(
-            scaled_size,
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
+        self.display_size = self.image_size * self.zoom_factor
+        
+        if self.zoom_factor > 1.0:
+            # Magnified views are painted straight from the original, visible area only
+            self._paint_from_source = True
+            self._smooth_paint = not fast
+            self.scaled_pixmap = QPixmap()
+            self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+            self._update_scale_factors()
+            self.clear()
+            if self.size() != self.display_size:
+                self.resize(self.display_size)
+            self.update()
+            if fast:
+                self._refine_timer.start(150)
+            else:
+                self._refine_timer.stop()
+            return
+        
+        self._paint_from_source = False
+        self.setAttribute(Qt.WA_OpaquePaintEvent, False)
+        
+        # Scale pixmap according to zoom factor, reusing a cached result when possible;
+        # cacheKey() changes with the pixmap data, so a new image never hits old entries
+        key = f"{self.original_pixmap.cacheKey()}:{round(self.zoom_factor, 3)}"
+        cached = QPixmapCache.find(key)
+        if cached is not None:
+            self._refine_timer.stop()
+            self.scaled_pixmap = cached
+        elif fast:
+            # Not cached, the smooth version replaces it when the user stops zooming
+            self.scaled_pixmap = self._mip_source(self.display_size.width()).scaled(
+                self.display_size,
+                Qt.KeepAspectRatio,
+                Qt.FastTransformation
+            )
+            self._refine_timer.start(150)
+        else:
+            self._refine_timer.stop()
+            self.scaled_pixmap = self._mip_source(self.display_size.width()).scaled(
+                self.display_size,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+            QPixmapCache.insert(key, self.scaled_pixmap)
         
         # Update widget
-        self.setPixmap(self.scaled_pixmap)
-        self.resize(self.scaled_pixmap.size())
+        self.display_size = self.scaled_pixmap.size()
+        self._update_scale_factors()
+        
+        # Skip no-op updates, they would still trigger a relayout; cacheKey() matches only
+        # when the label already holds this exact pixmap, not just one of the same size
+        current = self.pixmap()
+        if current is None or current.cacheKey() != self.scaled_pixmap.cacheKey():
+            self.setPixmap(self.scaled_pixmap)
+        if self.size() != self.display_size:
+            self.resize(self.display_size)
+    
+    def _update_scale_factors(self):
+        """Recompute the display/image coordinate scales for the current display size."""
+        if self.display_size.isEmpty():
+            return
+        
+        self._img_to_disp_x = self.display_size.width() / self.image_size.width()
+        self._img_to_disp_y = self.display_size.height() / self.image_size.height()
+        self._disp_to_img_x = 1.0 / self._img_to_disp_x
+        self._disp_to_img_y = 1.0 / self._img_to_disp_y
+        
+        # Display -> original_pixmap pixels, for painting magnified views from the source
+        self._disp_to_src_x = self.original_pixmap.width() / self.display_size.width()
+        self._disp_to_src_y = self.original_pixmap.height() / self.display_size.height()
+    
+    def _refine_display(self):
+        """Redraw the current zoom with smooth scaling."""
+        self.update_display()
+    
+    def _flush_zoom(self):
+        """Apply the wheel zoom collected since the last flush."""
+        zoom_mul = self._pending_zoom_mul
+        self._pending_zoom_mul = 1.0
+        self.set_zoom(self.zoom_factor * zoom_mul, interactive=True)
+    
+    def paintEvent(self, event):
+        """Paint the image, from the original pixmap when magnified, and the crop overlay."""
+        if not self._paint_from_source:
+            super().paintEvent(event)
+            if self.crop_selection.isNull():
+                return
+            painter = QPainter(self)
+        else:
+            # Only the exposed part of the visible region is drawn, so cost follows the viewport size
+            target = event.rect().intersected(self.visibleRegion().boundingRect())
+            if target.isEmpty():
+                return
+            
+            sx, sy = self._disp_to_src_x, self._disp_to_src_y
+            source = QRectF(target.x() * sx, target.y() * sy, target.width() * sx, target.height() * sy)
+            
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, self._smooth_paint)
+            painter.drawPixmap(QRectF(target), self.original_pixmap, source)
+        
+        if not self.crop_selection.isNull():
+            painter.setPen(self._crop_pen)
+            painter.setBrush(self._crop_brush)
+            painter.drawRect(self.crop_selection.adjusted(1, 1, -1, -1))
+        painter.end()
     
     def wheelEvent(self, event: QWheelEvent):
         """Handle mouse wheel for zooming."""
         if event.modifiers() == Qt.ControlModifier:
             # Zoom with Ctrl + wheel
             angle_delta = event.angleDelta().y()
-            zoom_factor = 1.1 if angle_delta > 0 else 0.9
             
-            if angle_delta > 0:
-                self.zoom_in(zoom_factor)
-            else:
-                self.zoom_out(1/zoom_factor)
+            # Already pinned at the zoom limit in this direction, nothing would change
+            pending_zoom = self.zoom_factor * self._pending_zoom_mul
+            if (angle_delta > 0 and pending_zoom >= self.max_zoom) or \
+               (angle_delta <= 0 and pending_zoom <= self.min_zoom):
+                return
+            
+            self._pending_zoom_mul *= 1.1 if angle_delta > 0 else 0.9
+            
+            if not self._zoom_flush_timer.isActive():
+                self._zoom_flush_timer.start(16)
         else:
             super().wheelEvent(event)
     
@@ -153,12 +380,11 @@ class ImageLabel(QLabel):
                 # Start crop selection
                 self.crop_start_point = event.pos()
                 self.crop_end_point = event.pos()
-                self.crop_rubber_band.setGeometry(QRect(self.crop_start_point, self.crop_end_point))
-                self.crop_rubber_band.show()
+                self.set_crop_rect(QRect())
                 self.setCursor(Qt.CrossCursor)
             else:
-                # Start panning
-                self.pan_start_point = event.pos()
+                # Start panning (global position, the label itself moves as it scrolls)
+                self.pan_start_point = event.globalPos()
                 self.pan_active = True
                 self.setCursor(Qt.ClosedHandCursor)
         
@@ -185,36 +411,49 @@ class ImageLabel(QLabel):
             crop_rect = QRect(self.crop_start_point, self.crop_end_point).normalized()
             
             # Constrain crop selection to image bounds
-            if not self.scaled_pixmap.isNull():
-                image_rect = QRect(0, 0, self.scaled_pixmap.width(), self.scaled_pixmap.height())
+            if not self.display_size.isEmpty():
+                image_rect = QRect(0, 0, self.display_size.width(), self.display_size.height())
                 crop_rect = crop_rect.intersected(image_rect)
             
-            self.crop_rubber_band.setGeometry(crop_rect)
-            self.crop_selection = crop_rect
+            self.set_crop_rect(crop_rect)
+            
+            if not self._crop_emit_timer.isActive():
+                self._crop_emit_timer.start()
         
         elif self.pan_active and event.buttons() == Qt.LeftButton:
-            # Handle panning by adjusting scroll area position
-            scroll_area = self.get_scroll_area()
+            # Accumulate the movement, the scroll bars are updated at most once per frame
+            delta = event.globalPos() - self.pan_start_point
+            self._pan_dx += delta.x()
+            self._pan_dy += delta.y()
             
-            if scroll_area:
-                # Calculate movement delta
-                delta = event.pos() - self.pan_start_point
-                
-                # Get current scroll bar values
-                h_scroll = scroll_area.horizontalScrollBar()
-                v_scroll = scroll_area.verticalScrollBar()
-                
-                # Apply pan movement (invert delta for natural feeling)
-                h_scroll.setValue(h_scroll.value() - delta.x())
-                v_scroll.setValue(v_scroll.value() - delta.y())
-                
-                # Update pan start point for next move
-                self.pan_start_point = event.pos()
+            # Update pan start point for next move
+            self.pan_start_point = event.globalPos()
+            
+            if not self._pan_timer.isActive():
+                self._pan_timer.start()
         
         super().mouseMoveEvent(event)
     
+    def _flush_pan(self):
+        """Scroll by the pan movement collected since the last flush."""
+        dx, dy = self._pan_dx, self._pan_dy
+        self._pan_dx = self._pan_dy = 0
+        if not dx and not dy:
+            return
+        
+        scroll_area = self.get_scroll_area()
+        if scroll_area:
+            # Apply pan movement (invert delta for natural feeling)
+            h_scroll = scroll_area.horizontalScrollBar()
+            v_scroll = scroll_area.verticalScrollBar()
+            h_scroll.setValue(h_scroll.value() - dx)
+            v_scroll.setValue(v_scroll.value() - dy)
+    
     def get_scroll_area(self):
         """Get the parent scroll area."""
+        if self._scroll_area_ref is not None:
+            return self._scroll_area_ref
+        
         parent = self.parent()
         while parent:
             if hasattr(parent, 'horizontalScrollBar') and hasattr(parent, 'verticalScrollBar'):
@@ -227,15 +466,15 @@ class ImageLabel(QLabel):
         if event.button() == Qt.LeftButton:
             if self.crop_mode:
                 # Finalize crop selection
-                if self.crop_selection.width() > 5 and self.crop_selection.height() > 5:
-                    # Only emit signal if selection is large enough
-                    self.crop_selection_changed.emit(self.crop_selection)
-                else:
+                self._crop_emit_timer.stop()
+                if not (self.crop_selection.width() > 5 and self.crop_selection.height() > 5):
                     # Clear small selections
-                    self.crop_rubber_band.hide()
-                    self.crop_selection = QRect()
+                    self.set_crop_rect(QRect())
+                self._emit_crop_selection()
             else:
-                # End panning
+                # End panning, applying any movement still pending
+                self._pan_timer.stop()
+                self._flush_pan()
                 self.pan_active = False
                 # Restore appropriate cursor
                 if not self.original_pixmap.isNull():
@@ -245,12 +484,23 @@ class ImageLabel(QLabel):
         
         super().mouseReleaseEvent(event)
     
+    def set_crop_rect(self, rect: QRect):
+        """Set the crop selection in display coordinates and repaint only the area it touched."""
+        dirty = self.crop_selection.united(rect)
+        self.crop_selection = rect
+        if not dirty.isNull():
+            # Pad by the pen width so the old border is fully erased
+            self.update(dirty.adjusted(-3, -3, 3, 3))
+    
+    def _emit_crop_selection(self):
+        """Emit the current crop selection."""
+        self.crop_selection_changed.emit(self.crop_selection)
+    
     def enable_crop_mode(self, enabled: bool):
         """Enable or disable crop selection mode."""
         self.crop_mode = enabled
         if not enabled:
-            self.crop_rubber_band.hide()
-            self.crop_selection = QRect()
+            self.set_crop_rect(QRect())
         
         # Update cursor based on mode
         if enabled:
@@ -266,17 +516,15 @@ class ImageLabel(QLabel):
             return QRect()
         
         # Convert from widget coordinates to image coordinates
-        scale_x = self.original_pixmap.width() / self.scaled_pixmap.width()
-        scale_y = self.original_pixmap.height() / self.scaled_pixmap.height()
-        
-        image_rect = QRect(
-            int(self.crop_selection.x() * scale_x),
-            int(self.crop_selection.y() * scale_y),
-            int(self.crop_selection.width() * scale_x),
-            int(self.crop_selection.height() * scale_y)
-        )
+        selection = self.crop_selection
+        image_rect = QRect(*map_rect(selection.x(), selection.y(), selection.width(), selection.height(),
+                                     self._disp_to_img_x, self._disp_to_img_y))
         
         return image_rect
+    
+    def image_rect_to_display(self, x: int, y: int, width: int, height: int) -> QRect:
+        """Convert a rectangle in image coordinates to widget coordinates at the current zoom."""
+        return QRect(*map_rect(x, y, width, height, self._img_to_disp_x, self._img_to_disp_y))
 
 class ImageViewer(QWidget):
     """Main image viewer widget with scroll area and controls."""
@@ -289,6 +537,13 @@ class ImageViewer(QWidget):
         super().__init__()
         
         self.current_image = None
+        
+        # Large images are converted on a private pool; Qt's own image conversion
+        # splits work across the global pool, so sharing it could starve itself
+        self._convert_generation = 0
+        self._convert_pool = QThreadPool(self)
+        self._convert_pool.setMaxThreadCount(1)
+        
         self.init_ui()
     
     def init_ui(self):
@@ -307,6 +562,7 @@ class ImageViewer(QWidget):
         # Create image label
         self.image_label = ImageLabel()
         self.scroll_area.setWidget(self.image_label)
+        self.image_label._scroll_area_ref = self.scroll_area
         
         # Connect signals
         self.image_label.crop_selection_changed.connect(self.crop_selection_changed.emit)
@@ -314,10 +570,54 @@ class ImageViewer(QWidget):
         
         layout.addWidget(self.scroll_area)
     
-    def set_image(self, image: np.ndarray):
-        """Set the image to display."""
+    def set_image(self, image: np.ndarray, file_path: Optional[str] = None):
+        """Set the image to display; pass the file it was just loaded from to decode a JPEG preview at reduced size."""
         self.current_image = image
-        self.image_label.set_image(image)
+        self._convert_generation += 1
+        if image is None:
+            self.image_label.set_image(None)
+            return
+        
+        # Arrays shown before (e.g. the original after a reset) come straight from the cache
+        pixmap, levels = find_cached_qpixmap(image)
+        if pixmap is not None:
+            self.image_label.set_pixmap(pixmap, mip_levels=levels or None)
+            return
+        
+        if image.shape[0] * image.shape[1] <= ASYNC_CONVERT_PIXELS:
+            self.image_label.set_pixmap(numpy_to_qpixmap(image))
+            return
+        
+        # Show a low-resolution placeholder now and swap in the full image when it is ready;
+        # the label is told the full size so zoom and crop coordinates are right from the start
+        viewport = self.scroll_area.viewport().size()
+        image_size = QSize(image.shape[1], image.shape[0])
+        # Fit the viewport, but never above half size so the preview stays cheap
+        height, width = image.shape[:2]
+        preview_width, preview_height = min(viewport.width(), width // 2), min(viewport.height(), height // 2)
+        preview = image
+        if file_path is not None and os.path.splitext(file_path)[1].lower() in ('.jpg', '.jpeg'):
+            # libjpeg decodes at 1/2-1/8 scale for less work than shrinking the full array
+            reduced = load_reduced(file_path, preview_width, preview_height)
+            if reduced is not None and abs(reduced.shape[1] * height - reduced.shape[0] * width) <= width + height:
+                preview = reduced  # same aspect ratio, so it is the same picture
+        self.image_label.set_pixmap(numpy_to_qpixmap_scaled(preview, preview_width, preview_height), image_size)
+        
+        task = _PixmapConvertTask(image, self._convert_generation)
+        task.signals.finished.connect(self._on_pixmap_ready)
+        self._convert_pool.start(task)
+    
+    def _on_pixmap_ready(self, generation: int, q_image: QImage, levels: list):
+        """Show a pixmap converted on the thread pool, unless a newer image has been set."""
+        if generation != self._convert_generation:
+            return
+        
+        pixmap = QPixmap.fromImage(q_image)
+        mip_levels = [QPixmap.fromImage(level) for level in levels]
+        cache_qpixmap(self.current_image, pixmap, mip_levels)
+        
+        # Replace the placeholder in place; the user may already have zoomed or scrolled
+        self.image_label.set_pixmap(pixmap, mip_levels=mip_levels, keep_view=True)
     
     def get_image(self) -> np.ndarray:
         """Get the current image."""
@@ -353,8 +653,7 @@ class ImageViewer(QWidget):
     
     def clear_crop_selection(self):
         """Clear the current crop selection."""
-        self.image_label.crop_selection = QRect()
-        self.image_label.crop_rubber_band.hide()
+        self.image_label.set_crop_rect(QRect())
     
     def has_crop_selection(self) -> bool:
         """Check if there is a valid crop selection."""
@@ -6,12 +6,13 @@ Provides the main GUI interface with menu bar, image viewer, control panels, and
 
 import os
 import sys
+import tempfile
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QMenuBar, QMenu, QAction, QFileDialog, QMessageBox, QStatusBar,
     QProgressBar, QLabel, QFrame, QScrollArea, QApplication, QDialog
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QThreadPool
 from PyQt5.QtGui import QPixmap, QIcon, QKeySequence
 import numpy as np
 
@@ -19,8 +20,14 @@ from src.ui.image_viewer import ImageViewer
 from src.ui.control_panel import ControlPanel
 from src.ui.dialogs import CropDialog, RotateDialog, ResizeDialog
 from src.core.image_processor import ImageProcessor, FilterType, NoiseType
-from src.core.threading_manager import get_thread_manager
-from src.utils.image_utils import get_image_file_filter, validate_image_file, get_image_info
+from src.core.threading_manager import get_thread_manager, SaveImageTask, SnapshotTask
+from src.utils.image_utils import (
+    get_image_file_filter, validate_image_file, get_image_info,
+    with_default_extension
+)
+
+# Originals larger than this are kept in a temporary file and memory-mapped instead of held in RAM
+SNAPSHOT_MMAP_BYTES = 256 * 1024 * 1024
 
 class MainWindow(QMainWindow):
     """Main application window."""
@@ -29,12 +36,26 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.current_image = None
         self.original_image = None
+        self._image_info_key = None  # layout last shown in the image info label
+        self._snapshot_path = None  # temporary file backing (or being written for) original_image
+        self._snapshot_files = []  # snapshot files not deleted yet
         self.image_processor = ImageProcessor()
         self.current_file_path = None
         
         # Initialize thread manager
         self.thread_manager = get_thread_manager()
         
+        # Saves run here, one at a time; a private pool keeps Qt's own use of the global pool unblocked
+        self._save_pool = QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
+        self._saving = False
+        
+        # Brightness/contrast changes are coalesced and dispatched once the sliders settle
+        self._bc_timer = QTimer(self)
+        self._bc_timer.setSingleShot(True)
+        self._bc_timer.setInterval(50)
+        self._bc_timer.timeout.connect(self._dispatch_bc)
+        
         # Initialize UI
         self.init_ui()
         self.setup_menu_bar()
@@ -96,18 +117,18 @@ class MainWindow(QMainWindow):
         file_menu.addAction(open_action)
         
         # Save action
-        save_action = QAction('Save', self)
-        save_action.setShortcut(QKeySequence.Save)
-        save_action.setStatusTip('Save the current image')
-        save_action.triggered.connect(self.save_image)
-        file_menu.addAction(save_action)
+        self.save_action = QAction('Save', self)
+        self.save_action.setShortcut(QKeySequence.Save)
+        self.save_action.setStatusTip('Save the current image')
+        self.save_action.triggered.connect(self.save_image)
+        file_menu.addAction(self.save_action)
         
         # Save As action
-        save_as_action = QAction('Save As...', self)
-        save_as_action.setShortcut(QKeySequence.SaveAs)
-        save_as_action.setStatusTip('Save the current image with a new name')
-        save_as_action.triggered.connect(self.save_image_as)
-        file_menu.addAction(save_as_action)
+        self.save_as_action = QAction('Save As...', self)
+        self.save_as_action.setShortcut(QKeySequence.SaveAs)
+        self.save_as_action.setStatusTip('Save the current image with a new name')
+        self.save_as_action.triggered.connect(self.save_image_as)
+        file_menu.addAction(self.save_as_action)
         
         file_menu.addSeparator()
         
@@ -262,13 +283,13 @@ class MainWindow(QMainWindow):
         self.thread_manager.processing_progress.connect(self.on_processing_progress)
         self.thread_manager.processing_status.connect(self.on_processing_status)
         
-        # Control panel signals
-        self.control_panel.brightness_changed.connect(self.update_brightness_contrast)
-        self.control_panel.contrast_changed.connect(self.update_brightness_contrast)
-        self.control_panel.blur_changed.connect(self.apply_blur)
-        self.control_panel.sharpen_changed.connect(self.apply_sharpen)
-        self.control_panel.noise_requested.connect(self.add_noise)
-        self.control_panel.filter_requested.connect(self.apply_filter)
+        # Control panel signals, queued so the panel's click/timer handlers return immediately
+        self.control_panel.brightness_changed.connect(self.update_brightness_contrast, Qt.QueuedConnection)
+        self.control_panel.contrast_changed.connect(self.update_brightness_contrast, Qt.QueuedConnection)
+        self.control_panel.blur_changed.connect(self.apply_blur, Qt.QueuedConnection)
+        self.control_panel.sharpen_changed.connect(self.apply_sharpen, Qt.QueuedConnection)
+        self.control_panel.noise_requested.connect(self.add_noise, Qt.QueuedConnection)
+        self.control_panel.filter_requested.connect(self.apply_filter, Qt.QueuedConnection)
     
     def center_window(self):
         """Center the window on the screen."""
@@ -309,22 +330,70 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Error", "Failed to load image.")
                 return
             
-            # Store image data
-            self.original_image = image.copy()
-            self.current_image = image.copy()
+            # Drop any adjustment still waiting for the previous image
+            self._bc_timer.stop()
+            
+            # Store image data; processing always returns new arrays, so both can share the decoded buffer
+            self.original_image = image
+            self.current_image = image
             self.current_file_path = file_path
             
             # Update UI
-            self.image_viewer.set_image(self.current_image)
+            self.image_viewer.set_image(self.current_image, file_path)
             self.control_panel.reset_controls()
             self.update_image_info()
             
+            # The previous original is no longer referenced, so its snapshot file can go
+            self._snapshot_path = None
+            if image.nbytes > SNAPSHOT_MMAP_BYTES:
+                self._start_snapshot(image)
+            self._remove_snapshots()
+            
             # Update status
             self.status_label.setText(f"Loaded: {os.path.basename(file_path)}")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load image: {str(e)}")
     
+    def _start_snapshot(self, image: np.ndarray):
+        """Write the image to a temporary file on the save pool; it replaces original_image once written."""
+        # Only the empty file is created here so that every snapshot path is known to the GUI thread
+        with tempfile.NamedTemporaryFile(prefix="pixelwiz_", suffix=".raw", delete=False) as f:
+            self._snapshot_path = f.name
+        self._snapshot_files.append(self._snapshot_path)
+        
+        task = SnapshotTask(image, self._snapshot_path)
+        task.signals.finished.connect(self._on_snapshot_written)
+        self._save_pool.start(task)
+    
+    def _on_snapshot_written(self, image: np.ndarray, file_path: str, success: bool):
+        """Swap the in-memory original for a memory map of its snapshot file."""
+        if not success or file_path != self._snapshot_path or self.original_image is not image:
+            # Failed, or another image was loaded meanwhile
+            if file_path == self._snapshot_path:
+                self._snapshot_path = None
+            self._remove_snapshots()
+            return
+        
+        # The OS can page the original out under memory pressure; mode 'r' also guards against in-place edits.
+        # The decoded array is freed once nothing else (current_image, the viewer) refers to it.
+        self.original_image = np.memmap(file_path, dtype=image.dtype, mode='r', shape=image.shape)
+    
+    def _remove_snapshots(self):
+        """Delete snapshot files that no longer back original_image."""
+        for path in list(self._snapshot_files):
+            if path == self._snapshot_path:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Windows refuses while a map of the file is still open; retried on the next load and on close
+                print(f"Error removing snapshot file: {e}")
+                continue
+            self._snapshot_files.remove(path)
+    
     def save_image(self):
         """Save the current image."""
         if self.current_image is None:
@@ -342,7 +411,8 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No image to save.")
             return
         
-        file_filter = "PNG (*.png);;JPEG (*.jpg);;BMP (*.bmp);;TIFF (*.tiff);;All Files (*)"
+        # JPEG first: much faster to encode than PNG for large images
+        file_filter = "JPEG (*.jpg);;PNG (*.png);;BMP (*.bmp);;TIFF (*.tiff);;All Files (*)"
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Save Image",
@@ -351,27 +421,49 @@ class MainWindow(QMainWindow):
         )
         
         if file_path:
-            self.save_image_to_path(file_path)
+            self.save_image_to_path(with_default_extension(file_path, self.current_image))
     
     def save_image_to_path(self, file_path: str):
-        """Save image to specified path."""
+        """Save image to specified path in the background."""
+        if self._saving:
+            return
+        
         try:
-            success = self.image_processor.save_image(self.current_image, file_path)
-            if success:
-                self.current_file_path = file_path
-                self.status_label.setText(f"Saved: {os.path.basename(file_path)}")
-                QMessageBox.information(self, "Success", "Image saved successfully.")
-            else:
-                QMessageBox.warning(self, "Error", "Failed to save image.")
+            task = SaveImageTask(self.current_image, file_path)
+            task.signals.finished.connect(self.on_save_finished)
+            self._set_saving(True)
+            self.status_label.setText(f"Saving {os.path.basename(file_path)}...")
+            self._save_pool.start(task)
         except Exception as e:
+            self._set_saving(False)
             QMessageBox.critical(self, "Error", f"Failed to save image: {str(e)}")
     
+    def _set_saving(self, saving: bool):
+        """Show save progress and block further saves while one is running."""
+        self._saving = saving
+        self.save_action.setEnabled(not saving)
+        self.save_as_action.setEnabled(not saving)
+        self.progress_bar.setRange(0, 0 if saving else 100)  # busy indicator while saving
+        self.progress_bar.setVisible(saving)
+    
+    def on_save_finished(self, file_path: str, success: bool):
+        """Handle completion of a background save."""
+        self._set_saving(False)
+        if success:
+            self.current_file_path = file_path
+            self.status_label.setText(f"Saved: {os.path.basename(file_path)}")
+            QMessageBox.information(self, "Success", "Image saved successfully.")
+        else:
+            self.status_label.setText("Save failed")
+            QMessageBox.warning(self, "Error", "Failed to save image.")
+    
     def reset_to_original(self):
         """Reset image to original state."""
         if self.original_image is None:
             return
         
-        self.current_image = self.original_image.copy()
+        self._bc_timer.stop()
+        self.current_image = self.original_image
         self.image_viewer.set_image(self.current_image)
         self.control_panel.reset_controls()
         self.status_label.setText("Reset to original image")
@@ -398,7 +490,14 @@ class MainWindow(QMainWindow):
         self.thread_manager.process_image(self.current_image, "filter", filter_type=filter_type)
     
     def update_brightness_contrast(self):
-        """Update image brightness and contrast."""
+        """Schedule a brightness/contrast update, restarting the wait on every change."""
+        if self.current_image is None:
+            return
+        
+        self._bc_timer.start()
+    
+    def _dispatch_bc(self):
+        """Apply the current brightness and contrast slider values."""
         if self.current_image is None:
             return
         
@@ -408,6 +507,7 @@ class MainWindow(QMainWindow):
         self.thread_manager.process_image(
             self.original_image,  # Always apply to original to avoid cumulative effects
             "brightness_contrast",
+            supersede=True,
             brightness=brightness,
             contrast=contrast
         )
@@ -420,6 +520,7 @@ class MainWindow(QMainWindow):
         self.thread_manager.process_image(
             self.current_image,
             "blur",
+            supersede=True,
             blur_type=blur_type,
             kernel_size=kernel_size
         )
@@ -432,6 +533,7 @@ class MainWindow(QMainWindow):
         self.thread_manager.process_image(
             self.current_image,
             "sharpen",
+            supersede=True,
             method=method,
             strength=strength
         )
@@ -444,6 +546,7 @@ class MainWindow(QMainWindow):
         self.thread_manager.process_image(
             self.current_image,
             "add_noise",
+            supersede=True,
             noise_type=noise_type,
             intensity=intensity
         )
@@ -525,9 +628,16 @@ class MainWindow(QMainWindow):
     def update_image_info(self):
         """Update image info display."""
         if self.current_image is None:
+            self._image_info_key = None
             self.image_info_label.setText("")
             return
         
+        # Most operations keep the size and type, so the label is usually already right
+        key = (self.current_image.shape, self.current_image.dtype, self.current_image.nbytes)
+        if key == self._image_info_key:
+            return
+        self._image_info_key = key
+        
         info = get_image_info(self.current_image)
         self.image_info_label.setText(
             f"{info['width']}×{info['height']} | {info['color_mode']} | {info['size_mb']:.1f} MB"
@@ -535,9 +645,11 @@ class MainWindow(QMainWindow):
     
     def on_processing_finished(self, result: np.ndarray):
         """Handle completion of image processing."""
-        self.current_image = result
-        self.image_viewer.set_image(self.current_image)
-        self.update_image_info()
+        # An unknown blur, sharpen or filter type returns its input, which is the array already on screen
+        if not self._is_displayed(result):
+            self.current_image = result
+            self.image_viewer.set_image(self.current_image)
+            self.update_image_info()
         self.progress_bar.setVisible(False)
         self.status_label.setText("Processing completed")
         
@@ -546,6 +658,15 @@ class MainWindow(QMainWindow):
             self.crop_dialog.deleteLater()
             self.crop_dialog = None
     
+    def _is_displayed(self, image: np.ndarray) -> bool:
+        """Check whether an array is, or views exactly the same pixels as, the current image."""
+        current = self.current_image
+        if image is current:
+            return True
+        return (current is not None and image.ctypes.data == current.ctypes.data
+                and image.shape == current.shape and image.strides == current.strides
+                and image.dtype == current.dtype)
+    
     def on_processing_error(self, error_msg: str):
         """Handle processing errors."""
         self.progress_bar.setVisible(False)
@@ -587,4 +708,14 @@ class MainWindow(QMainWindow):
         if self.thread_manager.is_busy():
             self.thread_manager.cancel_current_operation()
         
+        # Let a running save or snapshot finish writing its file
+        self._save_pool.waitForDone()
+        
+        # Release every reference to a memory-mapped original before deleting the file behind it
+        self.original_image = None
+        self.current_image = None
+        self.image_viewer.set_image(None)
+        self._snapshot_path = None
+        self._remove_snapshots()
+        
         event.accept()
@@ -0,0 +1,22 @@
+"""
+Crop coordinate math for PixelWiz
+
+Maps rectangles between display and image coordinates.
+"""
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; map_rect falls back to plain Python
+    njit = None
+
+def _map_rect(x, y, w, h, sx, sy):
+    """Scale a rectangle by (sx, sy) and truncate to ints."""
+    return (int(x * sx), int(y * sy), int(w * sx), int(h * sy))
+
+if njit is not None:
+    map_rect = njit(cache=True)(_map_rect)
+
+    # Compile once at import so the first crop doesn't pay for the JIT
+    map_rect(0, 0, 1, 1, 1.0, 1.0)
+else:
+    map_rect = _map_rect
@@ -6,70 +6,156 @@ Contains helper functions for image conversion, validation, and common operation
 
 import numpy as np
 import cv2
-from PyQt5.QtGui import QPixmap, QImage
+from PIL import Image
+from PyQt5.QtGui import QPixmap, QImage, QPixmapCache
 from PyQt5.QtCore import Qt
+from PyQt5 import sip
 from typing import Optional, Tuple, List
 import os
+import weakref
+from functools import lru_cache
+
+# Qt >= 5.14 renders OpenCV's BGR bytes directly; older versions need a channel swap to RGB888
+HAS_BGR888 = hasattr(QImage, 'Format_BGR888')
+
+# The single place that sizes the global QPixmapCache (in KB). It holds the converted pixmaps and their
+# mip levels from here plus ImageLabel's scaled views, so leave room for a few full-size images
+QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), 256 * 1024))
+
+# Cache key -> (weak reference to the source array, number of mip levels stored with it).
+# Arrays are never modified in place, so a key stays valid exactly as long as its array lives.
+_pixmap_sources = {}
+
+def _pixmap_cache_key(image: np.ndarray) -> str:
+    """Build the QPixmapCache key for an array's conversion."""
+    return f"np:{id(image)}:{image.ctypes.data}:{image.shape}:{image.nbytes}"
+
+def _prune_pixmap_cache():
+    """Remove cached conversions of freed arrays, which can never be hit again."""
+    for key, (ref, mip_count) in list(_pixmap_sources.items()):
+        if ref() is None:
+            del _pixmap_sources[key]
+            QPixmapCache.remove(key)
+            for i in range(mip_count):
+                QPixmapCache.remove(f"{key}:mip{i}")
+
+def find_cached_qpixmap(image: np.ndarray) -> Tuple[Optional[QPixmap], List[QPixmap]]:
+    """Get the cached conversion of an array and the mip levels stored with it, if any."""
+    key = _pixmap_cache_key(image)
+    entry = _pixmap_sources.get(key)
+    if entry is None or entry[0]() is not image:
+        return None, []
+    
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None or pixmap.isNull():
+        return None, []
+    
+    levels = []
+    for i in range(entry[1]):
+        level = QPixmapCache.find(f"{key}:mip{i}")
+        if level is None:
+            break  # evicted; the levels before it are still a valid chain
+        levels.append(level)
+    return pixmap, levels
+
+def cache_qpixmap(image: np.ndarray, pixmap: QPixmap, levels: List[QPixmap] = ()):
+    """Store an array's conversion, and optionally its half-size mip levels, in QPixmapCache."""
+    _prune_pixmap_cache()
+    key = _pixmap_cache_key(image)
+    if not QPixmapCache.insert(key, pixmap):
+        return
+    
+    mip_count = 0
+    for level in levels:
+        if not QPixmapCache.insert(f"{key}:mip{mip_count}", level):
+            break
+        mip_count += 1
+    _pixmap_sources[key] = (weakref.ref(image), mip_count)
 
 def numpy_to_qpixmap(image: np.ndarray) -> QPixmap:
-    """Convert numpy array to QPixmap for display in Qt widgets."""
+    """Convert a BGR (or grayscale) numpy array to QPixmap for display in Qt widgets."""
     if image is None:
         return QPixmap()
     
+    pixmap, _ = find_cached_qpixmap(image)
+    if pixmap is None:
+        pixmap = _numpy_to_qpixmap_uncached(image)
+        cache_qpixmap(image, pixmap)
+    return pixmap
+
+def _numpy_to_qpixmap_uncached(image: np.ndarray) -> QPixmap:
+    """Convert an array to QPixmap without touching the pixmap cache."""
     # Ensure image is in the correct format
     if len(image.shape) == 3:
         height, width, channel = image.shape
-        bytes_per_line = 3 * width
         
-        # Ensure image is uint8
+        # Ensure image is uint8; one saturating OpenCV pass (convertScaleAbs would mirror negatives)
         if image.dtype != np.uint8:
-            image = np.clip(image, 0, 255).astype(np.uint8)
+            image = cv2.add(image, 0, dtype=cv2.CV_8U)
         
-        # Ensure memory is contiguous
-        if not image.flags['C_CONTIGUOUS']:
+        # Rows may be strided (e.g. a crop view); only the pixels within a row have to be packed
+        if image.strides[0] <= 0 or image.strides[1:] != (channel, 1):
             image = np.ascontiguousarray(image)
+        bytes_per_line = image.strides[0]
         
-        # Convert to bytes for QImage constructor
-        image_bytes = image.tobytes()
-        q_image = QImage(image_bytes, width, height, bytes_per_line, QImage.Format_RGB888)
+        # Wrap the array's own buffer; fromImage below makes the only copy
+        if HAS_BGR888:
+            q_image = QImage(sip.voidptr(image.ctypes.data), width, height, bytes_per_line, QImage.Format_BGR888)
+            q_image._numpy_ref = image  # keep the backing array alive as long as the QImage
+        else:
+            q_image = QImage(sip.voidptr(image.ctypes.data), width, height, bytes_per_line,
+                             QImage.Format_RGB888).rgbSwapped()
     else:
         # Grayscale image
         height, width = image.shape
-        bytes_per_line = width
         
         if image.dtype != np.uint8:
-            image = np.clip(image, 0, 255).astype(np.uint8)
+            image = cv2.add(image, 0, dtype=cv2.CV_8U)
         
-        # Ensure memory is contiguous
-        if not image.flags['C_CONTIGUOUS']:
+        if image.strides[0] <= 0 or image.strides[1] != 1:
             image = np.ascontiguousarray(image)
+        bytes_per_line = image.strides[0]
         
-        # Convert to bytes for QImage constructor
-        image_bytes = image.tobytes()
-        q_image = QImage(image_bytes, width, height, bytes_per_line, QImage.Format_Grayscale8)
+        # Wrap the array's own buffer; fromImage below makes the only copy
+        q_image = QImage(sip.voidptr(image.ctypes.data), width, height, bytes_per_line, QImage.Format_Grayscale8)
+        q_image._numpy_ref = image  # keep the backing array alive as long as the QImage
     
     return QPixmap.fromImage(q_image)
 
+def numpy_to_qpixmap_scaled(image: np.ndarray, target_width: int, target_height: int) -> QPixmap:
+    """Convert to QPixmap, first shrinking to fit the target with INTER_AREA if the image is at least twice as big."""
+    height, width = image.shape[:2]
+    target_width, target_height = max(1, target_width), max(1, target_height)
+    if width >= target_width * 2 or height >= target_height * 2:
+        # Shrinking the array first keeps the full-size copy out of Qt and skips its scaler
+        scale = min(target_width / width, target_height / height)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        # The resized array is discarded right away, so caching its conversion could never pay off
+        return _numpy_to_qpixmap_uncached(cv2.resize(image, size, interpolation=cv2.INTER_AREA))
+    return numpy_to_qpixmap(image)
+
 def qpixmap_to_numpy(pixmap: QPixmap) -> Optional[np.ndarray]:
-    """Convert QPixmap to numpy array."""
+    """Convert QPixmap to a BGR numpy array."""
     if pixmap.isNull():
         return None
     
     image = pixmap.toImage()
     
-    # Convert to RGB format
-    image = image.convertToFormat(QImage.Format_RGB888)
+    # Convert to BGR format to match the rest of the pipeline
+    image = image.convertToFormat(QImage.Format_BGR888 if HAS_BGR888 else QImage.Format_RGB888)
     
     width = image.width()
     height = image.height()
+    bytes_per_line = image.bytesPerLine()
     
     # Get image data
-    ptr = image.bits()
-    ptr.setsize(image.byteCount())
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
     
-    # Convert to numpy array
-    arr = np.array(ptr).reshape(height, width, 3)
-    return arr
+    # View the rows (which may be padded to 4 bytes) and copy once, since the bits die with the QImage
+    arr = np.frombuffer(ptr, dtype=np.uint8).reshape(height, bytes_per_line)[:, :width * 3]
+    arr = arr.reshape(height, width, 3)
+    return arr.copy() if HAS_BGR888 else arr[..., ::-1].copy()
 
 def scale_pixmap_to_fit(pixmap: QPixmap, target_size: Tuple[int, int], keep_aspect_ratio: bool = True) -> QPixmap:
     """Scale pixmap to fit within target size while optionally maintaining aspect ratio."""
@@ -85,29 +171,38 @@ def scale_pixmap_to_fit(pixmap: QPixmap, target_size: Tuple[int, int], keep_aspe
     
     return scaled_pixmap
 
-def get_supported_image_formats() -> List[str]:
-    """Get list of supported image file formats."""
-    return [
-        '*.jpg', '*.jpeg', '*.png', '*.bmp', '*.tiff', '*.tif',
-        '*.gif', '*.ico', '*.webp', '*.ppm', '*.pgm', '*.pbm'
-    ]
+def build_pyramid(image: np.ndarray, min_size: int = 512) -> List[np.ndarray]:
+    """Return the image followed by successive half-size copies, stopping near min_size pixels."""
+    levels = [image]
+    while max(levels[-1].shape[:2]) // 2 >= min_size:
+        level = levels[-1]
+        # INTER_AREA averages each 2x2 block, so levels don't alias like plain [::2, ::2] slicing
+        levels.append(cv2.resize(level, (level.shape[1] // 2, level.shape[0] // 2), interpolation=cv2.INTER_AREA))
+    return levels
+
+# Supported formats and the file dialog filter are fixed, so build them once at import
+SUPPORTED_IMAGE_FORMATS = (
+    '*.jpg', '*.jpeg', '*.png', '*.bmp', '*.tiff', '*.tif',
+    '*.gif', '*.ico', '*.webp', '*.ppm', '*.pgm', '*.pbm'
+)
+
+IMAGE_FILE_FILTER = ';;'.join([
+    f"All Images ({' '.join(SUPPORTED_IMAGE_FORMATS)})",
+    "JPEG (*.jpg *.jpeg)",
+    "PNG (*.png)",
+    "BMP (*.bmp)",
+    "TIFF (*.tiff *.tif)",
+    "GIF (*.gif)",
+    "All Files (*)"
+])
+
+def get_supported_image_formats() -> Tuple[str, ...]:
+    """Get the supported image file formats."""
+    return SUPPORTED_IMAGE_FORMATS
 
 def get_image_file_filter() -> str:
     """Get file filter string for image files."""
-    formats = get_supported_image_formats()
-    all_formats = ' '.join(formats)
-    
-    filter_parts = [
-        f"All Images ({all_formats})",
-        "JPEG (*.jpg *.jpeg)",
-        "PNG (*.png)",
-        "BMP (*.bmp)",
-        "TIFF (*.tiff *.tif)",
-        "GIF (*.gif)",
-        "All Files (*)"
-    ]
-    
-    return ';;'.join(filter_parts)
+    return IMAGE_FILE_FILTER
 
 def validate_image_file(file_path: str) -> bool:
     """Validate if file is a supported image format."""
@@ -115,28 +210,70 @@ def validate_image_file(file_path: str) -> bool:
         return False
     
     try:
-        # Try to load with OpenCV
-        image = cv2.imread(file_path)
-        return image is not None
+        # Check the file structure only; pixels are decoded later by load_image
+        with Image.open(file_path) as im:
+            im.verify()
+        return True
     except:
-        return False
+        # Formats Pillow can't parse may still have an OpenCV decoder (checked by signature)
+        try:
+            return cv2.haveImageReader(file_path)
+        except:
+            return False
+
+# Decode-time downscale flags, largest reduction first
+_REDUCED_COLOR_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+def load_reduced(file_path: str, target_width: int, target_height: int) -> Optional[np.ndarray]:
+    """Load an image decoded at the smallest 1/2, 1/4 or 1/8 scale that still covers the target size."""
+    try:
+        # Only the header is read to get the full size
+        with Image.open(file_path) as im:
+            width, height = im.size
+    except:
+        return cv2.imread(file_path)
+    
+    for factor, flag in _REDUCED_COLOR_FLAGS:
+        if width // factor >= target_width and height // factor >= target_height:
+            # JPEG decodes straight to the reduced size; other formats are shrunk after decoding
+            return cv2.imread(file_path, flag)
+    return cv2.imread(file_path)
+
+def with_default_extension(file_path: str, image: np.ndarray) -> str:
+    """Append .jpg, or .png for images with alpha, if OpenCV can't tell the format from the path.
+    
+    JPEG is the default because encoding a large image as PNG (DEFLATE) can take minutes.
+    """
+    if os.path.splitext(file_path)[1] and cv2.haveImageWriter(file_path):
+        return file_path
+    has_alpha = image.ndim == 3 and image.shape[2] == 4
+    return file_path + ('.png' if has_alpha else '.jpg')
 
 def get_image_info(image: np.ndarray) -> dict:
-    """Get information about an image."""
+    """Get information about an image (a shared dict; don't modify it)."""
     if image is None:
         return {}
     
+    return _image_info(image.shape, image.dtype, image.nbytes)
+
+@lru_cache(maxsize=8)
+def _image_info(shape: Tuple[int, ...], dtype: np.dtype, nbytes: int) -> dict:
+    """Build the info dict for an image layout; arrays aren't hashable, so cache on their attributes."""
     info = {
-        'shape': image.shape,
-        'dtype': str(image.dtype),
-        'size_mb': image.nbytes / (1024 * 1024),
+        'shape': shape,
+        'dtype': str(dtype),
+        'size_mb': nbytes / (1024 * 1024),
     }
     
-    if len(image.shape) == 3:
-        info['height'], info['width'], info['channels'] = image.shape
-        info['color_mode'] = 'RGB' if image.shape[2] == 3 else 'RGBA'
+    if len(shape) == 3:
+        info['height'], info['width'], info['channels'] = shape
+        info['color_mode'] = 'RGB' if shape[2] == 3 else 'RGBA'
     else:
-        info['height'], info['width'] = image.shape
+        info['height'], info['width'] = shape
         info['channels'] = 1
         info['color_mode'] = 'Grayscale'
     
@@ -156,7 +293,7 @@ def calculate_zoom_to_fit(image_size: Tuple[int, int], container_size: Tuple[int
     return min(zoom_x, zoom_y)
 
 def clamp_value(value: float, min_val: float, max_val: float) -> float:
-    """Clamp value between min and max."""
+    """Clamp value between min and max (kept for compatibility; inline the comparison in hot paths)."""
     return max(min_val, min(value, max_val))
 
 def format_file_size(size_bytes: int) -> str:
@@ -182,7 +319,7 @@ def create_checkerboard_background(width: int, height: int, square_size: int = 1
     return pixmap
 
 def safe_divide(a: float, b: float, default: float = 0.0) -> float:
-    """Safely divide two numbers, returning default if division by zero."""
+    """Safely divide two numbers, returning default if division by zero (prefer inline `a / b if b else default`)."""
     try:
         return a / b if b != 0 else default
     except:
@@ -195,9 +332,10 @@ def ensure_image_bounds(image: np.ndarray, x: int, y: int, width: int, height: i
     
     img_height, img_width = image.shape[:2]
     
-    x = max(0, min(x, img_width - 1))
-    y = max(0, min(y, img_height - 1))
-    width = max(1, min(width, img_width - x))
-    height = max(1, min(height, img_height - y))
+    # Plain comparisons; this runs on every crop drag event and max/min calls add up
+    x = 0 if x < 0 else (img_width - 1 if x > img_width - 1 else x)
+    y = 0 if y < 0 else (img_height - 1 if y > img_height - 1 else y)
+    width = 1 if width < 1 else (img_width - x if width > img_width - x else width)
+    height = 1 if height < 1 else (img_height - y if height > img_height - y else height)
     
     return x, y, width, height